@@ -0,0 +1,31 @@
+# spring_explorer/__init__.py
+import os
+
+# --- Lazy Exports ---
+# The CLI and explorer pull in javalang/networkx and the whole analysis stack, so they are
+# only imported on first attribute access (e.g. `from spring_explorer import InteractiveSpringExplorer`).
+# Set SPRING_EXPLORER_EAGER=1 to import everything up front (CI uses this to catch broken deferred imports).
+_LAZY_EXPORTS = {
+    "InteractiveSpringExplorer": ".cli",
+    "SpringBootExplorer": ".explorer",
+}
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value # Cache so __getattr__ is only hit once per name
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if os.environ.get("SPRING_EXPLORER_EAGER", "").lower() in ("1", "true", "yes"):
+    for _name in __all__: __getattr__(_name)
+# --- End Lazy Exports ---
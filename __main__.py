@@ -1,114 +1,171 @@
 # spring_explorer/__main__.py
-import argparse
 import os
-import sys
-import shutil
 
 # --- Local Imports ---
-# Import necessary components from our package
-from .cli import InteractiveSpringExplorer
-# CORRECTED IMPORT LINE: Added 'success'
-from .utils import logger, info, warning, error, success
-# Import the utils module itself to modify its global USE_COLORS
-import spring_explorer.utils as utils
+# Only `os` is imported at module level. Package modules (utils, cli) and stdlib helpers
+# (sys, shutil, subprocess, errno) are imported where used, so `--help` and argument errors
+# never load the analysis stack and importing this module has no side effects.
 # --- End Local Imports ---
 
 
+# Must match SpringBootExplorer's cache_dir name
+CACHE_DIRNAME = ".explorer_cache"
+
+
+# --- Lazy Output Helpers ---
+# Importing utils configures logging and detects color support, so defer it to the first print.
+def _info(text):
+    from .utils import info; return info(text)
+def _success(text):
+    from .utils import success; return success(text)
+def _warning(text):
+    from .utils import warning; return warning(text)
+def _error(text):
+    from .utils import error; return error(text)
+# --- End Lazy Output Helpers ---
+
+
+# --- Cache Removal ---
+def _fast_rmtree(path):
+    # Native `rm -r` unlinks large caches without per-entry Python calls; shutil is the portable fallback.
+    # Raises FileNotFoundError when path is missing, so callers don't need a separate exists() check.
+    import shutil
+    if os.name == "posix" and shutil.which("rm"):
+        import subprocess
+        # No -f so a missing path fails; stdin is closed so rm never prompts on write-protected files
+        res = subprocess.run(["rm", "-r", "--", path], stdin=subprocess.DEVNULL, capture_output=True, text=True)
+        if res.returncode != 0:
+            if not os.path.lexists(path):
+                import errno
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+            raise OSError(res.stderr.strip() or f"rm exited with status {res.returncode}")
+    else:
+        shutil.rmtree(path)
+
+
+def _clear_cache(cache_dir, *, fatal):
+    # fatal=True (--clear-cache-only): returns the process exit code.
+    # fatal=False (--no-cache): best effort, failures only warn and None is returned.
+    # No exists() probe first: a missing cache surfaces as FileNotFoundError from the removal itself,
+    # so nothing is announced before the outcome is known.
+    try:
+        _fast_rmtree(cache_dir)
+        print(_success(f"Cache directory cleared: {cache_dir}"))
+    except FileNotFoundError:
+        print(_info("Cache directory not found, nothing to clear."))
+    except Exception as e:
+        if fatal: print(_error(f"Failed to clear cache directory: {e}")); return 1
+        print(_warning(f"Could not clear existing cache directory (continuing without cache): {e}"))
+    return 0 if fatal else None
+# --- End Cache Removal ---
+
+
+# --- Argument Parsing ---
+# Hand-rolled instead of argparse: one positional and three boolean flags don't justify
+# importing argparse (and its gettext/re/textwrap dependencies) on every invocation.
+_USAGE = "usage: python -m spring_explorer [-h] [--force-color] [--no-cache] [--clear-cache-only] [project_path]"
+_HELP = f"""{_USAGE}
+
+Spring Boot Code Explorer - Analyze and browse Spring Boot projects.
+
+positional arguments:
+  project_path        Path to the Spring Boot project root directory (default: current directory).
+
+options:
+  -h, --help          show this help message and exit
+  --force-color       Force enable colored terminal output.
+  --no-cache          Ignore and clear any existing analysis cache on startup.
+  --clear-cache-only  Only clear the cache for the project path and exit. Does not run analysis.
+
+Run without arguments in a project directory or specify path."""
+# Built once at import; _parse_args only does dict/set lookups per token
+_FLAGS = {"--force-color": "force_color", "--no-cache": "no_cache", "--clear-cache-only": "clear_cache_only"}
+_HELP_FLAGS = frozenset(("-h", "--help"))
+
+
+def _usage_error(message):
+    # Mirrors argparse: usage + message on stderr, exit status 2
+    import sys
+    print(f"{_USAGE}\nerror: {message}", file=sys.stderr)
+    raise SystemExit(2)
+
+
+def _parse_args(argv):
+    from types import SimpleNamespace
+    args = SimpleNamespace(project_path='.', force_color=False, no_cache=False, clear_cache_only=False)
+    positionals = []; options_done = False
+    for arg in argv:
+        if options_done or arg == '-' or not arg.startswith('-'): positionals.append(arg)
+        elif arg == '--': options_done = True # Everything after '--' is positional
+        elif arg in _HELP_FLAGS: print(_HELP); raise SystemExit(0)
+        elif arg in _FLAGS: setattr(args, _FLAGS[arg], True)
+        else: _usage_error(f"unrecognized arguments: {arg}")
+    if len(positionals) > 1: _usage_error(f"unrecognized arguments: {' '.join(positionals[1:])}")
+    if positionals: args.project_path = positionals[0]
+    return args
+# --- End Argument Parsing ---
+
+
 # --- Main Function ---
-def main():
-    parser = argparse.ArgumentParser(
-        description="Spring Boot Code Explorer - Analyze and browse Spring Boot projects.",
-        epilog="Run without arguments in a project directory or specify path. Use --interactive (default) for CLI."
-    )
-    parser.add_argument(
-        "project_path",
-        nargs='?',
-        default='.',
-        help="Path to the Spring Boot project root directory (default: current directory)."
-    )
-    # --interactive is arguably the default, but keep flag for clarity maybe? Or remove.
-    # parser.add_argument(
-    #     "--interactive",
-    #     action="store_true",
-    #     help="Launch the interactive command-line interface (default behavior)."
-    # )
-    parser.add_argument(
-        "--force-color",
-        action="store_true",
-        help="Force enable colored terminal output."
-    )
-    parser.add_argument(
-        "--no-cache",
-        action="store_true",
-        help="Ignore and clear any existing analysis cache on startup."
-    )
-    parser.add_argument(
-        "--clear-cache-only",
-        action="store_true",
-        help="Only clear the cache for the project path and exit. Does not run analysis."
-    )
-
-
-    args = parser.parse_args()
+def main(argv=None):
+    # argv lets embedders and test harnesses call main() repeatedly without patching sys.argv
+    if argv is None:
+        import sys
+        argv = sys.argv[1:]
+    args = _parse_args(argv)
 
     # --- Handle Color Override ---
     if args.force_color:
-        print(info("Forcing color output ON."))
-        utils.USE_COLORS = True # Modify the global in the imported utils module
+        from . import utils
+        utils.set_use_colors(True) # Must run before cli/explorer import the color helpers
+        print(_info("Forcing color output ON."))
 
     # --- Handle Cache Clearing ---
-    project_abs_path = os.path.abspath(args.project_path)
-    cache_dir = os.path.join(project_abs_path, ".explorer_cache")
+    # Default '.' is just the cwd and absolute paths only need normalizing; abspath only for relative paths
+    project_path = args.project_path
+    if project_path == '.': project_abs_path = os.getcwd()
+    elif os.path.isabs(project_path): project_abs_path = os.path.normpath(project_path)
+    else: project_abs_path = os.path.abspath(project_path)
+    # project_abs_path is already normalized, so plain concatenation replaces os.path.join (rstrip covers '/' and 'C:\\')
+    cache_dir = f"{project_abs_path.rstrip(os.sep)}{os.sep}{CACHE_DIRNAME}"
 
     if args.clear_cache_only:
-        if os.path.exists(cache_dir):
-            try:
-                print(info(f"Clearing cache directory: {cache_dir}"))
-                shutil.rmtree(cache_dir)
-                print(success("Cache cleared successfully."))
-                return 0
-            except Exception as e:
-                print(error(f"Failed to clear cache directory: {e}"))
-                return 1
-        else:
-            print(info("Cache directory not found, nothing to clear."))
-            return 0
-
+        return _clear_cache(cache_dir, fatal=True)
     if args.no_cache:
-        if os.path.exists(cache_dir):
-            try:
-                print(info(f"Ignoring cache (--no-cache): Clearing existing cache at {cache_dir}"))
-                shutil.rmtree(cache_dir)
-            except Exception as e:
-                print(warning(f"Could not clear existing cache directory (continuing without cache): {e}"))
-        else:
-            print(info("No existing cache found to clear (--no-cache)."))
+        print(_info("Ignoring cache (--no-cache)."))
+        _clear_cache(cache_dir, fatal=False)
 
 
     # --- Run the Explorer ---
     try:
+        # Imported here so cache-only runs never pull in the parser/analyzer stack
+        from .cli import InteractiveSpringExplorer
         # Instantiate the CLI, which handles initialization and analysis
         explorer_cli = InteractiveSpringExplorer(project_abs_path)
         # Run the interactive loop
         explorer_cli.run()
         return 0 # Exit cleanly after CLI finishes
     except KeyboardInterrupt:
-        print(info("\nOperation cancelled by user."))
+        print(_info("\nOperation cancelled by user."))
         return 130 # Standard exit code for Ctrl+C
     except FileNotFoundError as e:
         # Error should be printed by InteractiveSpringExplorer __init__
-        # print(error(f"Error: Project path not found - {e}")) # Redundant?
+        # print(_error(f"Error: Project path not found - {e}")) # Redundant?
         return 1
     except ImportError as e:
         # Error should be printed by InteractiveSpringExplorer __init__ or module imports
         return 1
     except Exception as e:
         # Catch-all for unexpected critical errors during startup or run
-        logger.critical(f"A critical error occurred: {e}", exc_info=True)
-        print(error(f"A critical error occurred: {type(e).__name__} - {e}"))
-        print(error("Please check logs for more details."))
+        from .utils import logger # Only the failure path needs the logger
+        # Full traceback formatting (linecache + source reads) only when SPRING_EXPLORER_DEBUG is set
+        debug = os.environ.get("SPRING_EXPLORER_DEBUG", "").lower() in ("1", "true", "yes")
+        logger.critical("A critical error occurred: %s - %s", type(e).__name__, e, exc_info=debug)
+        print(_error(f"A critical error occurred: {type(e).__name__} - {e}"))
+        print(_error("Please check logs for more details." if debug else "Set SPRING_EXPLORER_DEBUG=1 for a full traceback."))
         return 1
 
 # --- Entry Point Check ---
 if __name__ == "__main__":
+    import sys
     sys.exit(main())
\ No newline at end of file
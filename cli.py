@@ -1,32 +1,146 @@
 # spring_explorer/cli.py
 import os
+import re
+import stat
 import sys
 import time
-from collections import defaultdict
+import heapq
+import io
+import threading
+import logging
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
 
 # --- Local Imports ---
 from .explorer import SpringBootExplorer
 from .utils import (logger, Colors, colored, header, menu_option, menu_title,
-                    success, error, info, warning, clear_screen)
+                    success, error, info, warning, clear_screen, open_source, batched_stdout,
+                    C_END, C_WHITE, C_BRIGHT_CYAN, C_BRIGHT_GREEN, C_BRIGHT_YELLOW, component_ansi)
 from .models import Method # Import Method if needed for type checking (e.g. in _select_...)
 # --- End Local Imports ---
 
 
+@lru_cache(maxsize=4096)
+def _cached_relpath(path, base):
+    # Menus re-render the same component/file paths over and over; relpath is pure for absolute inputs
+    return os.path.relpath(path, base)
+
+
+# --- Line Editing (readline) ---
+# Interactive sessions get input() history, line editing and tab completion from the stdlib readline module
+# (prompt_toolkit is not a dependency). Where readline is unavailable (e.g. Windows) plain input() is used.
+_readline = None
+_HISTORY_FILE = os.path.expanduser("~/.spring_explorer_history")
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+
+def _enable_line_editing():
+    global _readline
+    try: import readline
+    except ImportError: return
+    try: readline.read_history_file(_HISTORY_FILE)
+    except OSError: pass # First run or unreadable history
+    readline.set_history_length(1000)
+    import atexit; atexit.register(_save_history, readline)
+    # macOS ships libedit, which has its own binding syntax
+    readline.parse_and_bind("bind ^I rl_complete" if "libedit" in (readline.__doc__ or "") else "tab: complete")
+    readline.set_completer_delims(" \t\n") # Complete whole FQNs/method keys, not '.'-separated pieces
+    _readline = readline
+
+def _save_history(readline):
+    try: readline.write_history_file(_HISTORY_FILE)
+    except OSError: pass
+
+def _prompt(text=""):
+    # input() for every prompt in this module: readline needs the prompt's ANSI escapes marked zero-width (\001..\002),
+    # otherwise colored prompts throw off its cursor math when editing or recalling history.
+    if _readline is not None and text: text = _ANSI_ESCAPE.sub("\001\\g<0>\002", text)
+    return input(text)
+
+@contextmanager
+def _completion(words):
+    # Tab-completes against `words` for one prompt. The list is sorted on the first Tab only, then each lookup is a bisect.
+    if _readline is None: yield; return
+    sorted_words = None
+    def complete(text, state):
+        nonlocal sorted_words
+        if sorted_words is None: sorted_words = sorted(set(words))
+        i = bisect_left(sorted_words, text) + state
+        return sorted_words[i] if i < len(sorted_words) and sorted_words[i].startswith(text) else None
+    previous = _readline.get_completer(); _readline.set_completer(complete)
+    try: yield
+    finally: _readline.set_completer(previous)
+# --- End Line Editing ---
+
+
+# --- Background Analysis Logging ---
+class _HeldLogs(logging.Handler):
+    # While analysis runs in the background the main menu is waiting on input(), so log lines written to stderr would
+    # land on the live prompt. capture() collects the explorer's records instead; replay() sends them through the
+    # normal handlers once the main thread owns the terminal again (see _wait_for_analysis).
+    def __init__(self): super().__init__(); self.records = []
+    def emit(self, record): self.records.append(record)
+    def capture(self): logger.addHandler(self); logger.propagate = False
+    def replay(self): # Not release(): that name is Handler's lock method
+        logger.removeHandler(self); logger.propagate = True
+        records, self.records = self.records, []
+        for record in records: logger.handle(record)
+# --- End Background Analysis Logging ---
+
+
+# --- Terminal Output ---
+def _buffer_stdout():
+    # A tty stdout is line-buffered by default: every print() is its own write. Interactive sessions switch to block
+    # buffering; the builtin input() flushes stdout before prompting, and _pause() flushes before waiting.
+    reconfigure = getattr(sys.stdout, 'reconfigure', None) # Absent if stdout was replaced (e.g. by a StringIO)
+    if reconfigure is not None: reconfigure(line_buffering=False)
+
+def _pause(seconds):
+    # Lets a status message be read before the menu redraws. Interactive users can press Enter to skip the rest of
+    # the wait instead of sitting out a fixed sleep; piped/scripted input has nobody reading, so there is no wait.
+    if not sys.stdin.isatty(): sys.stdout.flush(); return
+    if os.name == 'nt': sys.stdout.flush(); time.sleep(seconds); return # select() only works on sockets there
+    import select
+    sys.stdout.write(colored(" (Enter to continue)", Colors.BRIGHT_BLACK)); sys.stdout.flush()
+    if select.select([sys.stdin], [], [], seconds)[0]: sys.stdin.readline() # Consume the Enter so the next prompt doesn't see it
+# --- End Terminal Output ---
+
+
+@lru_cache(maxsize=None)
+def _render_options(options):
+    # Option blocks are static per menu: color them once instead of on every redraw
+    return "\n".join(menu_option(key, label) for key, label in options)
+
+@lru_cache(maxsize=None)
+def _render_menu(title, options):
+    # Whole static submenu frame (title box + options), built once per menu and written with one call per redraw.
+    # Colors can't change after import (set_use_colors runs before cli is imported), so nothing needs invalidating.
+    return f"{menu_title(title)}\n{_render_options(options)}\n"
+
+
+# Box-drawing glyphs for call/caller trees, indexed by is_last: (├─ or └─, child indent │ or blank)
+_TREE_CONNECTORS = ('├─ ', '└─ ')
+_TREE_INDENTS = ('│  ', '   ')
+_TREE_EMPTY = "None found.\n" # Only ever written for an empty top level; empty child lists are never pushed
+
+
 # --- Interactive CLI Class ---
 class InteractiveSpringExplorer:
-    def __init__(self, project_path):
-        try:
-            self.explorer = SpringBootExplorer(project_path)
-            print(info("Initializing and analyzing project... This may take a moment."))
-            self.explorer.analyze_project() # Call analysis here
-            print(success("Analysis complete. Explorer ready."))
-        except FileNotFoundError as e: print(error(f"Initialization failed: Project path not found - {e}")); sys.exit(1)
-        except ImportError as e: print(error(f"Initialization failed: Missing library - {e}")); sys.exit(1) # Catch import errors too
-        except Exception as e: print(error(f"Unexpected initialization error: {e}")); logger.error("Initialization error", exc_info=True); sys.exit(1)
+    # Static (key, label) option lists, rendered once through _render_options / _render_menu
+    _STRUCTURE_OPTIONS = ((1, "View Full Tree (ASCII)"), (2, "Browse Interactively"), (0, "Back to Main Menu"))
+    _COMPONENTS_OPTIONS = ((1, "View All Spring Components"), (2, "Filter by Type"), (3, "View Component Details by Name"), (0, "Back to Main Menu"))
+    _SEARCH_OPTIONS = ((1, "Search Methods by Name"), (2, "Search Code (Strings/Identifiers)"), (0, "Back to Main Menu"))
+    _METHOD_ANALYSIS_OPTIONS = ((1, "Analyze by Searching Name"), (2, "Analyze by Entering Full Key"), (0, "Back to Main Menu"))
+    _FILE_GIT_OPTIONS = ((1, "Convert Files/Directory to Text"), (2, "Browse Files Interactively"), (3, "Create Git Patch from Local Changes"), (0, "Back to Main Menu"))
+    _SETTINGS_OPTIONS = ((1, "Clear Cache & Re-analyze Project"), (2, "Debug: Show Annotations & Component Types"), (3, "Debug: List Java Parsing Errors"), (0, "Back to Main Menu"))
+    _SPINNER_FRAMES = "|/-\\"
 
-    def run(self):
-        # Menu definition using function references
-        menu = {
+    def __init__(self, project_path):
+        self._analysis_done = threading.Event(); self._analysis_error = None
+        # Main menu definition using function references, built once per session
+        self._main_menu = {
             '1': ("Project Structure", self.project_structure_menu),
             '2': ("Spring Components", self.spring_components_menu),
             '3': ("Search", self.search_menu),
@@ -34,68 +148,119 @@ class InteractiveSpringExplorer:
             '5': ("File / Git Operations", self.file_git_operations_menu),
             '6': ("Settings & Debug", self.settings_menu)
         }
-        while True:
-            clear_screen(); print(menu_title("Spring Boot Code Explorer"))
-            print(f"Project: {colored(self.explorer.project_path, Colors.BRIGHT_GREEN)}")
-            # Safely access explorer attributes
-            comp_count = len(self.explorer.components) if hasattr(self.explorer, 'components') else 0
-            meth_count = len(self.explorer.methods) if hasattr(self.explorer, 'methods') else 0
-            print(f"Components: {colored(comp_count, Colors.BRIGHT_YELLOW)}, Methods: {colored(meth_count, Colors.BRIGHT_YELLOW)}")
-            if hasattr(self.explorer, 'parse_errors') and self.explorer.parse_errors:
-                print(warning(f"Parsing Errors: {len(self.explorer.parse_errors)}"))
+        self._main_menu_options = tuple((k, v[0]) for k, v in self._main_menu.items()) + ((0, "Exit"),)
+        try:
+            self.explorer = SpringBootExplorer(project_path)
+        except Exception as e: self._exit_on_init_error(e)
+        self._git_dir = os.path.join(self.explorer.project_path, '.git') # Probed by create_patch_menu on every visit
+        self._frame_cache = {} # See _cached_frame
+        self._task_executor = None # Single worker thread for long git/file operations, created on first use
+        # Interactive sessions analyze in a background thread so the main menu (and the file tree, once built)
+        # is usable while parsing runs; menus that need results wait on _analysis_done.
+        # Piped/scripted input has no think-time to overlap, so it keeps the deterministic synchronous path.
+        self._held_logs = None
+        if sys.stdin.isatty():
+            _enable_line_editing(); _buffer_stdout()
+            print(info("Analyzing project in the background... Menus will wait for results when needed."))
+            self._held_logs = _HeldLogs(); self._held_logs.capture()
+            self._analysis_thread = threading.Thread(target=self._run_analysis, name="spring-explorer-analysis", daemon=True)
+            self._analysis_thread.start()
+        else:
+            print(info("Initializing and analyzing project... This may take a moment."))
+            self._run_analysis()
+            if self._analysis_error is not None: self._exit_on_init_error(self._analysis_error)
+            print(success("Analysis complete. Explorer ready."))
 
-            print("\nMain Menu:"); [print(menu_option(k, v[0])) for k, v in menu.items()]; print(menu_option(0, "Exit"))
+    def _run_analysis(self):
+        try: self.explorer.analyze_project()
+        except Exception as e: self._analysis_error = e # Reported by the main thread, which owns the terminal
+        finally: self._analysis_done.set()
+
+    def _exit_on_init_error(self, e):
+        if isinstance(e, FileNotFoundError): print(error(f"Initialization failed: Project path not found - {e}"))
+        elif isinstance(e, ImportError): print(error(f"Initialization failed: Missing library - {e}")) # Catch import errors too
+        else: print(error(f"Unexpected initialization error: {e}")); logger.error("Initialization error", exc_info=e)
+        sys.exit(1)
+
+    def _wait_for_analysis(self, structure_only=False):
+        # The file tree is complete once parsing starts (files_total is set), so structure views need not wait for the rest
+        def ready(): return self._analysis_done.is_set() or (structure_only and self.explorer.files_total > 0)
+        if not ready():
+            print(info("Waiting for project analysis to finish..."), flush=True)
+            while not ready(): self._analysis_done.wait(0.2)
+        if self._held_logs is not None and self._analysis_done.is_set(): self._held_logs.replay(); self._held_logs = None # Analysis logged its last line
+        if self._analysis_error is not None: self._exit_on_init_error(self._analysis_error)
+
+    def run(self):
+        menu = self._main_menu
+        while True:
+            with batched_stdout() as out: # Whole frame goes out in one write; the input() prompt stays outside
+                clear_screen(out); print(menu_title("Spring Boot Code Explorer"), file=out)
+                print(f"Project: {colored(self.explorer.project_path, Colors.BRIGHT_GREEN)}", file=out)
+                # components/methods/parse_errors are always initialized by SpringBootExplorer.__init__
+                explorer = self.explorer
+                if not self._analysis_done.is_set():
+                    progress = f"{explorer.files_parsed}/{explorer.files_total} Java files parsed" if explorer.files_total else "building file index"
+                    print(info(f"Analyzing... {progress} (press Enter to refresh)"), file=out)
+                print(f"Components: {colored(len(explorer.components), Colors.BRIGHT_YELLOW)}, Methods: {colored(len(explorer.methods), Colors.BRIGHT_YELLOW)}", file=out)
+                if explorer.parse_errors:
+                    print(warning(f"Parsing Errors: {len(explorer.parse_errors)}"), file=out)
+
+                print("\nMain Menu:", file=out); print(_render_options(self._main_menu_options), file=out)
 
             try:
-                choice = input(colored("\nEnter choice: ", Colors.BRIGHT_WHITE)).strip()
+                choice = _prompt(colored("\nEnter choice: ", Colors.BRIGHT_WHITE)).strip()
                 if choice == '0':
                     print(info("Exiting Spring Boot Explorer...")); break
                 elif choice in menu:
+                    self._wait_for_analysis(structure_only=(choice == '1')) # No-op once analysis has finished
                     menu[choice][1]() # Call the associated menu function
+                elif not choice and not self._analysis_done.is_set(): continue # Just redraw the progress line
                 else:
-                    print(error("Invalid choice. Please try again.")); time.sleep(1)
+                    print(error("Invalid choice. Please try again.")); _pause(1)
             except KeyboardInterrupt:
                 clear_screen(); print(info("\nCtrl+C detected. Exiting...")); break
             except Exception as e:
                 # Log the full error but show a simpler message to the user
                 logger.error("Error in main CLI loop", exc_info=True)
                 print(error(f"An unexpected error occurred: {type(e).__name__} - {e}"));
-                input(colored("Press Enter to return to the main menu...", Colors.BOLD))
+                _prompt(colored("Press Enter to return to the main menu...", Colors.BOLD))
 
     # --- Menu Handlers ---
 
     def project_structure_menu(self):
         while True:
-            clear_screen(); print(menu_title("Project Structure Menu"))
-            print(menu_option(1, "View Full Tree (ASCII)")); print(menu_option(2, "Browse Interactively")); print(menu_option(0, "Back to Main Menu"))
-            choice = input(colored("\nEnter choice: ", Colors.BRIGHT_WHITE)).strip()
+            with batched_stdout() as out:
+                clear_screen(out); out.write(_render_menu("Project Structure Menu", self._STRUCTURE_OPTIONS))
+            choice = _prompt(colored("\nEnter choice: ", Colors.BRIGHT_WHITE)).strip()
             if choice == '0': break
             elif choice == '1':
-                clear_screen(); print(menu_title("Project File Tree"))
-                try:
-                    self.explorer.print_project_structure()
-                except Exception as e:
-                    logger.error("Error printing project structure", exc_info=True)
-                    print(error(f"Could not display structure: {e}"))
-                input(colored("\nPress Enter to return...", Colors.BOLD))
+                with batched_stdout() as out: # The full tree can be long; emit it in one write
+                    clear_screen(out); print(menu_title("Project File Tree"), file=out)
+                    try:
+                        self.explorer.print_project_structure(out)
+                    except Exception as e:
+                        logger.error("Error printing project structure", exc_info=True)
+                        print(error(f"Could not display structure: {e}"), file=out)
+                _prompt(colored("\nPress Enter to return...", Colors.BOLD))
             elif choice == '2':
                 try:
                     self.explorer.interactive_structure_browser()
                 except Exception as e:
                     logger.error("Error during interactive browsing", exc_info=True)
-                    print(error(f"Browser error: {e}")); time.sleep(2)
-            else: print(error("Invalid choice.")); time.sleep(1)
+                    print(error(f"Browser error: {e}")); _pause(2)
+            else: print(error("Invalid choice.")); _pause(1)
 
     def spring_components_menu(self):
         while True:
-            clear_screen(); print(menu_title("Spring Components Menu"));
-            print(menu_option(1, "View All Spring Components")); print(menu_option(2, "Filter by Type")); print(menu_option(3, "View Component Details by Name")); print(menu_option(0, "Back to Main Menu"))
-            choice = input(colored("\nEnter choice: ", Colors.BRIGHT_WHITE)).strip()
+            with batched_stdout() as out:
+                clear_screen(out); out.write(_render_menu("Spring Components Menu", self._COMPONENTS_OPTIONS))
+            choice = _prompt(colored("\nEnter choice: ", Colors.BRIGHT_WHITE)).strip()
             if choice == '0': break
             elif choice == '1': self._show_all_components()
             elif choice == '2': self.filter_components_menu()
             elif choice == '3': self._select_component_for_details()
-            else: print(error("Invalid choice.")); time.sleep(1)
+            else: print(error("Invalid choice.")); _pause(1)
 
     def _show_all_components(self):
         clear_screen(); print(menu_title("All Detected Spring Components"))
@@ -103,35 +268,30 @@ class InteractiveSpringExplorer:
             comps = self.explorer.get_spring_components()
             if comps:
                 print(success(f"Found {len(comps)} Spring components:\n"))
-                for c in comps:
-                    # Use component_color utility for consistent coloring
-                    comp_color = Colors.component_color(c.component_type)
-                    type_str = colored(c.component_type, comp_color) if c.component_type else colored("Unknown", Colors.WHITE)
-                    fqn_str = colored(c.fully_qualified_name, comp_color)
-                    print(f"  - {fqn_str} ({type_str})")
+                # Lines are rendered once per component and reused on every visit to this listing
+                print("\n".join(c.cached_menu_line for c in comps))
             else:
                 print(warning("No Spring components were detected in the analyzed files."))
         except Exception as e:
             logger.error("Error getting/displaying all components", exc_info=True)
             print(error(f"Could not display components: {e}"))
-        input(colored("\nPress Enter to return...", Colors.BOLD))
+        _prompt(colored("\nPress Enter to return...", Colors.BOLD))
 
     def filter_components_menu(self):
         clear_screen(); print(menu_title("Filter Components by Type"))
         try:
             # Get unique, sorted component types from the explorer data
-            all_comps = self.explorer.components.values() if hasattr(self.explorer, 'components') else []
-            types = sorted(list(set(c.component_type for c in all_comps if c.component_type and c.component_type != "Unknown")))
+            types = self.explorer.get_component_types() # Sorted once per analysis
 
             if not types:
-                print(warning("No specific component types detected to filter by.")); time.sleep(1.5); return
+                print(warning("No specific component types detected to filter by.")); _pause(1.5); return
 
             print("Available types:")
             for i, t in enumerate(types):
                 print(menu_option(i+1, colored(t, Colors.component_color(t)))) # Use component color
             print(menu_option(0,"Cancel Filter"))
 
-            choice_str = input(colored("\nSelect type number to filter: ", Colors.BRIGHT_WHITE))
+            choice_str = _prompt(colored("\nSelect type number to filter: ", Colors.BRIGHT_WHITE))
             choice = int(choice_str)
 
             if choice == 0: return # Cancel
@@ -139,12 +299,12 @@ class InteractiveSpringExplorer:
                 selected_type = types[choice-1]
                 self._display_filtered_components(selected_type)
             else:
-                print(error("Invalid type number.")); time.sleep(1)
+                print(error("Invalid type number.")); _pause(1)
         except ValueError:
-            print(error("Invalid input. Please enter a number.")); time.sleep(1)
+            print(error("Invalid input. Please enter a number.")); _pause(1)
         except Exception as e:
             logger.error("Error during component filtering", exc_info=True)
-            print(error(f"Could not filter components: {e}")); time.sleep(1.5)
+            print(error(f"Could not filter components: {e}")); _pause(1.5)
 
 
     def _display_filtered_components(self, type_filter):
@@ -153,27 +313,27 @@ class InteractiveSpringExplorer:
             comps = self.explorer.get_spring_components(type_filter)
             if comps:
                 print(success(f"Found {len(comps)} component(s) of type '{type_filter}':\n"))
-                comp_color = Colors.component_color(type_filter)
-                for c in comps:
-                    print(f"  - {colored(c.fully_qualified_name, comp_color)}")
+                comp_color = component_ansi(type_filter)
+                print("\n".join(f"  - {comp_color}{c.fully_qualified_name}{C_END}" for c in comps))
             else:
                 print(warning(f"No components found matching type '{type_filter}'."))
         except Exception as e:
             logger.error(f"Error displaying filtered components for type {type_filter}", exc_info=True)
             print(error(f"Could not display components: {e}"))
-        input(colored("\nPress Enter to return...", Colors.BOLD))
+        _prompt(colored("\nPress Enter to return...", Colors.BOLD))
 
     def _select_component_for_details(self):
         clear_screen(); print(menu_title("View Component Details"))
-        name_part = input(colored("Enter component name (full or partial, case-insensitive): ", Colors.BRIGHT_WHITE)).strip()
-        if not name_part: print(warning("No name entered.")); time.sleep(1); return
+        comps = self.explorer.components.values()
+        with _completion([c.fully_qualified_name for c in comps] + [c.name for c in comps]):
+            name_part = _prompt(colored("Enter component name (full or partial, case-insensitive): ", Colors.BRIGHT_WHITE)).strip()
+        if not name_part: print(warning("No name entered.")); _pause(1); return
 
         try:
-            name_lower = name_part.lower()
-            matches = [c for fqn, c in self.explorer.components.items() if name_lower in fqn.lower()]
+            matches = self.explorer.search_component(name_part) # Uses the explorer's prebuilt lowercase index
 
             if not matches:
-                print(warning(f"No components found matching '{name_part}'.")); time.sleep(1.5)
+                print(warning(f"No components found matching '{name_part}'.")); _pause(1.5)
             elif len(matches) == 1:
                 self.show_component_details(matches[0]) # Show details directly
             else:
@@ -181,109 +341,95 @@ class InteractiveSpringExplorer:
                 self._select_from_multiple_components(matches, name_part)
         except Exception as e:
             logger.error(f"Error searching for component '{name_part}'", exc_info=True)
-            print(error(f"Could not search for component: {e}")); time.sleep(1.5)
+            print(error(f"Could not search for component: {e}")); _pause(1.5)
 
 
     def _select_from_multiple_components(self, matches, search_term):
         clear_screen(); print(menu_title(f"Multiple Matches for '{search_term}'"))
         print(warning(f"Found {len(matches)} components matching '{search_term}'. Please select one:"))
-        matches.sort(key=lambda c:c.fully_qualified_name) # Sort for consistent display
+        # matches come from explorer.search_component, already ordered by FQN
 
         for i, comp in enumerate(matches):
-            comp_color = Colors.component_color(comp.component_type)
-            type_str = colored(f"({comp.component_type})", comp_color) if comp.component_type else ""
-            fqn_str = colored(comp.fully_qualified_name, comp_color)
-            print(menu_option(i+1, f"{fqn_str} {type_str}"))
+            print(menu_option(i+1, comp.cached_match_label))
         print(menu_option(0,"Cancel Selection"))
 
         try:
-            choice_str = input(colored("\nSelect number: ", Colors.BRIGHT_WHITE))
+            choice_str = _prompt(colored("\nSelect number: ", Colors.BRIGHT_WHITE))
             sel = int(choice_str)
             if 0 < sel <= len(matches):
                 self.show_component_details(matches[sel-1]) # Show details for selected component
             elif sel == 0:
-                print(info("Selection cancelled.")) ; time.sleep(1)
-            else: print(error("Invalid selection number.")); time.sleep(1)
-        except ValueError: print(error("Invalid input. Please enter a number.")); time.sleep(1)
+                print(info("Selection cancelled.")) ; _pause(1)
+            else: print(error("Invalid selection number.")); _pause(1)
+        except ValueError: print(error("Invalid input. Please enter a number.")); _pause(1)
         except Exception as e: # Catch errors during detail display
             logger.error("Error showing details after selection", exc_info=True)
-            print(error(f"Could not show component details: {e}")); time.sleep(1.5)
+            print(error(f"Could not show component details: {e}")); _pause(1.5)
 
 
     def show_component_details(self, comp):
         while True: # Loop to allow actions within details view
-            clear_screen()
-            comp_color = Colors.component_color(comp.component_type)
-            print(menu_title(f"Component Details: {comp.name}"))
+            with batched_stdout() as out: # One write for the whole details frame
+                clear_screen(out)
+                comp_color = Colors.component_color(comp.component_type)
+                print(menu_title(f"Component Details: {comp.name}"), file=out)
 
-            print(f"Full Name:    {colored(comp.fully_qualified_name, comp_color)}")
-            print(f"Type:         {colored(comp.component_type, comp_color)}")
-            try:
-                rel_path = os.path.relpath(comp.file_path, self.explorer.project_path)
-            except ValueError: # Handle path errors (e.g., different drives on Windows)
-                rel_path = comp.file_path # Show absolute path as fallback
-            print(f"File:         {rel_path}")
-            print(f"Package:      {comp.package}")
-
-            if comp.annotations: print(f"\nAnnotations:  {', '.join(colored(a, Colors.BRIGHT_YELLOW) for a in comp.annotations)}")
-            if comp.generics: print(f"Generics:     <{', '.join(comp.generics)}>")
-            if comp.extends:
-                # Handle extends being str or list
-                extends_str = comp.extends if isinstance(comp.extends, str) else ', '.join(comp.extends)
-                print(f"Extends:      {extends_str}")
-            if comp.implements: print(f"Implements:   {', '.join(comp.implements)}")
-
-            # Display Fields
-            if comp.fields:
-                print(f"\n--- Fields ({len(comp.fields)}) ---")
-                # Sort fields by name for consistent display
-                for field_name, field_obj in sorted(comp.fields.items()):
-                    print(f"  - {field_obj}") # Uses Field.__str__
-                    if field_obj.annotations:
-                        print(f"      Annotations: {', '.join(colored(a, Colors.BRIGHT_YELLOW) for a in field_obj.annotations)}")
-            else: print("\n--- Fields: None ---")
-
-            # Display Methods (and Constructors)
-            # Sort methods/constructors by name/signature
-            m_list = []
-            for method_sig, method_obj in comp.methods.items():
-                display_name = method_sig # Default display
-                # Adjust display for constructors
-                if method_obj.name == '<init>':
-                    # Use class name + signature for display if needed, but method_sig usually has it
-                    display_name = f"{comp.name}{method_obj.signature}" # Reconstruct for clarity?
-                m_list.append((display_name, method_obj)) # Store (display_name, MethodObject)
-
-            m_list.sort(key=lambda x: x[0]) # Sort by display name
-
-            if m_list:
-                print(f"\n--- Methods ({len(m_list)}) ---")
-                method_map = {} # To map display index back to method object
-                for i, (disp_sig, method_obj) in enumerate(m_list):
-                    print(menu_option(i+1, colored(disp_sig, Colors.BRIGHT_CYAN)))
-                    method_map[i+1] = method_obj # Store object by display index
-            else: print("\n--- Methods: None ---")
-
-            # Action Menu for Component Details
-            print("\n--- Actions ---")
-            print(menu_option('v',"View Full Source Code"))
-            if m_list: print(menu_option('m',"Analyze a Method (Enter Number)"))
-            print(menu_option('0',"Back to Previous Menu"))
-
-            choice = input(colored("\nEnter action or method number: ", Colors.BRIGHT_WHITE)).strip().lower()
+                print(f"Full Name:    {colored(comp.fully_qualified_name, comp_color)}", file=out)
+                print(f"Type:         {colored(comp.component_type, comp_color)}", file=out)
+                try:
+                    rel_path = _cached_relpath(comp.file_path, self.explorer.project_path)
+                except ValueError: # Handle path errors (e.g., different drives on Windows)
+                    rel_path = comp.file_path # Show absolute path as fallback
+                print(f"File:         {rel_path}", file=out)
+                print(f"Package:      {comp.package}", file=out)
+
+                if comp.annotations: print(f"\nAnnotations:  {', '.join(colored(a, Colors.BRIGHT_YELLOW) for a in comp.annotations)}", file=out)
+                if comp.generics: print(f"Generics:     <{', '.join(comp.generics)}>", file=out)
+                if comp.extends:
+                    # Handle extends being str or list
+                    extends_str = comp.extends if isinstance(comp.extends, str) else ', '.join(comp.extends)
+                    print(f"Extends:      {extends_str}", file=out)
+                if comp.implements: print(f"Implements:   {', '.join(comp.implements)}", file=out)
+
+                # Display Fields
+                if comp.fields:
+                    print(f"\n--- Fields ({len(comp.fields)}) ---", file=out)
+                    # Sorted by name for consistent display (cached on the component)
+                    for field_name, field_obj in comp.sorted_fields:
+                        print(f"  - {field_obj}", file=out) # Uses Field.__str__
+                        if field_obj.annotations:
+                            print(f"      Annotations: {', '.join(colored(a, Colors.BRIGHT_YELLOW) for a in field_obj.annotations)}", file=out)
+                else: print("\n--- Fields: None ---", file=out)
+
+                # Display Methods (and Constructors), sorted by display name (cached on the component)
+                m_names, m_list = comp.sorted_method_arrays # Aligned lists; display number i is m_list[i-1]
+
+                if m_list:
+                    print(f"\n--- Methods ({len(m_list)}) ---", file=out)
+                    # Inlined menu_option(i, colored(disp_sig, Colors.BRIGHT_CYAN)); one print for the whole list
+                    print("\n".join(f"{C_BRIGHT_YELLOW}{i}{C_END} - {C_WHITE}{C_BRIGHT_CYAN}{disp_sig}{C_END}{C_END}" for i, disp_sig in enumerate(m_names, 1)), file=out)
+                else: print("\n--- Methods: None ---", file=out)
+
+                # Action Menu for Component Details
+                print("\n--- Actions ---", file=out)
+                print(menu_option('v',"View Full Source Code"), file=out)
+                if m_list: print(menu_option('m',"Analyze a Method (Enter Number)"), file=out)
+                print(menu_option('0',"Back to Previous Menu"), file=out)
+
+            choice = _prompt(colored("\nEnter action or method number: ", Colors.BRIGHT_WHITE)).strip().lower()
 
             if choice == '0': break # Exit component details view
             elif choice == 'v': self._view_source(comp)
             elif choice == 'm' and m_list:
-                self._select_method_for_analysis_from_list(method_map, comp) # Pass map and component
+                self._select_method_for_analysis_from_list(m_list, comp) # Pass sorted methods and component
             elif choice.isdigit() and m_list: # Allow entering method number directly
                 try:
                     idx = int(choice)
-                    if idx in method_map:
-                        self._analyze_selected_method(method_map[idx], comp)
-                    else: print(error("Invalid method number.")); time.sleep(1)
-                except ValueError: print(error("Invalid input.")); time.sleep(1) # Should not happen if isdigit passed
-            else: print(error("Invalid action choice.")); time.sleep(1)
+                    if 0 < idx <= len(m_list):
+                        self._analyze_selected_method(m_list[idx - 1], comp)
+                    else: print(error("Invalid method number.")); _pause(1)
+                except ValueError: print(error("Invalid input.")); _pause(1) # Should not happen if isdigit passed
+            else: print(error("Invalid action choice.")); _pause(1)
 
 
     def _view_source(self, comp_or_method_obj):
@@ -299,214 +445,203 @@ class InteractiveSpringExplorer:
             item_name = f"{comp_or_method_obj.parent_component.name}.{comp_or_method_obj.name}"
 
         if not file_path or not os.path.isfile(file_path):
-            print(error(f"Source file path not found or invalid for {item_name}.")); time.sleep(1.5); return
+            print(error(f"Source file path not found or invalid for {item_name}.")); _pause(1.5); return
 
         try:
             clear_screen(); print(colored(f"Source Code: {item_name}", Colors.BOLD)); print(colored(f"File: {file_path}", Colors.BRIGHT_BLACK)); print(colored("="*80, Colors.BRIGHT_CYAN))
-            content = ""; page_size = os.get_terminal_size().lines - 5 if hasattr(os, 'get_terminal_size') else 30
-            read_ok = False; encs = ['utf-8', 'latin-1', 'cp1252']
-
-            for enc in encs:
-                try:
-                    with open(file_path,'r',encoding=enc) as f: content=f.read(); read_ok=True; break
-                except UnicodeDecodeError: continue
-                except Exception as e_r: raise IOError(f"Read error ({enc}): {e_r}") from e_r
-            if not read_ok: raise IOError("Cannot read file with tested encodings")
-
-            lines = content.splitlines(); line_count = len(lines)
-            # Simple Pager
-            for page_start in range(0, line_count, page_size):
-                page_end = min(page_start + page_size, line_count)
-                # Add line numbers (optional but helpful)
-                page_lines_with_nums = []
-                for i in range(page_start, page_end):
-                    line_num = i + 1
-                    page_lines_with_nums.append(f"{colored(str(line_num).rjust(4), Colors.BRIGHT_BLACK)}: {lines[i]}")
-
-                print("\n".join(page_lines_with_nums))
-
-                if page_end < line_count:
-                    cont = input(colored(f"--More-- (Lines {page_start+1}-{page_end}/{line_count}) (Enter/q):", Colors.BRIGHT_YELLOW))
-                    if cont.lower() == 'q': break
-                else:
-                    print(colored("\n--End of File--", Colors.BRIGHT_YELLOW))
-
-            print(colored("="*80, Colors.BRIGHT_CYAN)); input(colored("Press Enter to return...", Colors.BOLD))
+            page_size = os.get_terminal_size().lines - 5 if hasattr(os, 'get_terminal_size') else 30
+
+            # Streamed: only the page on screen (plus one page of look-ahead) is ever held in memory
+            try: src = open_source(file_path)
+            except OSError as e_r: raise IOError(f"Read error: {e_r}") from e_r
+
+            with src:
+                # Simple Pager: each page is built as pre-encoded bytes and written in one call instead of per-line f-strings + print
+                out = getattr(sys.stdout, 'buffer', None); enc = sys.stdout.encoding or 'utf-8'
+                num_fmt = colored("%4d", Colors.BRIGHT_BLACK).encode(enc) + b": " # Line number prefix, formatted with bytes %
+                page = list(islice(src, page_size)); page_start = 0
+                buf = bytearray() # One page buffer, emptied after every write
+                while page:
+                    page_end = page_start + len(page)
+                    for line_num, line in enumerate(page, page_start + 1):
+                        buf += num_fmt % line_num; buf += line.rstrip('\n').encode(enc, 'replace'); buf += b"\n"
+                    if out is not None: sys.stdout.flush(); out.write(buf); out.flush() # Flush text layer first to keep ordering
+                    else: sys.stdout.write(buf.decode(enc)) # e.g. stdout replaced by a StringIO
+                    buf.clear() # Free the rendered page before blocking on the --More-- prompt
+
+                    page = list(islice(src, page_size)) # Look ahead one page so EOF is known without counting lines
+                    if page:
+                        cont = _prompt(colored(f"--More-- (Lines {page_start+1}-{page_end}) (Enter/q):", Colors.BRIGHT_YELLOW))
+                        if cont.lower() == 'q': break
+                    else:
+                        print(colored("\n--End of File--", Colors.BRIGHT_YELLOW))
+                    page_start = page_end
+            page = buf = None # File is closed; don't keep the look-ahead page alive while waiting below
+
+            print(colored("="*80, Colors.BRIGHT_CYAN)); _prompt(colored("Press Enter to return...", Colors.BOLD))
         except Exception as e:
             logger.error(f"Error reading/displaying source for {item_name}", exc_info=True)
-            print(error(f"Could not view source: {e}")); time.sleep(2)
+            print(error(f"Could not view source: {e}")); _pause(2)
 
 
-    def _select_method_for_analysis_from_list(self, method_map, component):
-        # Assumes method_map is {1: MethodObj1, 2: MethodObj2, ...}
+    def _select_method_for_analysis_from_list(self, methods, component):
+        # methods is in display order: number 1 is methods[0]
         try:
-            idx_str = input(colored("Enter method number to analyze: ", Colors.BRIGHT_WHITE))
+            idx_str = _prompt(colored("Enter method number to analyze: ", Colors.BRIGHT_WHITE))
             idx = int(idx_str)
-            if idx in method_map:
-                selected_method = method_map[idx]
+            if 0 < idx <= len(methods):
+                selected_method = methods[idx - 1]
                 self._analyze_selected_method(selected_method, component)
             else:
-                print(error("Invalid method number selected.")); time.sleep(1)
+                print(error("Invalid method number selected.")); _pause(1)
         except ValueError:
-            print(error("Invalid input. Please enter a number.")); time.sleep(1)
+            print(error("Invalid input. Please enter a number.")); _pause(1)
         except Exception as e:
             logger.error("Error during method selection/analysis", exc_info=True)
-            print(error(f"Could not analyze method: {e}")); time.sleep(1.5)
+            print(error(f"Could not analyze method: {e}")); _pause(1.5)
 
     def _analyze_selected_method(self, method_obj, component_obj):
-        # Construct the canonical key needed by the explorer's analysis method
+        # The explorer stores each method's exact key when registering it, so no signature re-parsing
+        # (which also dropped generics, e.g. List<String> -> List, and missed the registered key)
         try:
-            # Parameter types for the key might need careful extraction if not simple
-            # Basic extraction: Get type part, ignore generics for key matching usually
-            param_types = []
-            if hasattr(method_obj, 'parameters') and method_obj.parameters:
-                for p_sig in method_obj.parameters: # e.g., "String arg", "List<String> items"
-                    type_part = p_sig.split()[0]
-                    base_type = type_part.split('<')[0] # Get "String" or "List"
-                    # Resolve simple names if necessary (complex part) - using original logic for now
-                    # Assuming _resolve_type_name works correctly for this context:
-                    # resolved_type = self.explorer._resolve_type_name(base_type, component_obj)
-                    # For simplicity here, we'll just use the base_type found in the signature directly.
-                    # More robust analysis might require resolving against imports.
-                    param_types.append(base_type)
-
-            signature_key_part = f"({','.join(param_types)})"
-            method_key = f"{component_obj.fully_qualified_name}.{method_obj.name}{signature_key_part}"
-
-            # Call the main analysis display function
-            self.analyze_method(method_key)
+            self.analyze_method(method_obj.canonical_key)
 
         except Exception as e:
             logger.error(f"Error constructing key or calling analysis for {method_obj}", exc_info=True)
-            print(error(f"Could not prepare method for analysis: {e}")); time.sleep(1.5)
+            print(error(f"Could not prepare method for analysis: {e}")); _pause(1.5)
 
 
     def search_menu(self):
         while True:
-            clear_screen(); print(menu_title("Search Menu"));
-            print(menu_option(1,"Search Methods by Name")); print(menu_option(2,"Search Code (Strings/Identifiers)")); print(menu_option(0,"Back to Main Menu"))
-            choice = input(colored("\nEnter choice: ", Colors.BRIGHT_WHITE)).strip()
+            clear_screen(); sys.stdout.write(_render_menu("Search Menu", self._SEARCH_OPTIONS))
+            choice = _prompt(colored("\nEnter choice: ", Colors.BRIGHT_WHITE)).strip()
             if choice == '0': break
             elif choice == '1': self.search_methods()
             elif choice == '2': self.search_strings()
-            else: print(error("Invalid choice.")); time.sleep(1)
+            else: print(error("Invalid choice.")); _pause(1)
 
     def search_methods(self):
         clear_screen(); print(menu_title("Search Methods by Name"))
-        method_name = input(colored("Enter method name (case-insensitive): ", Colors.BRIGHT_WHITE)).strip()
-        if not method_name: print(warning("No method name entered.")); time.sleep(1); return
+        with _completion(m.name for m in self.explorer.methods.values()):
+            method_name = _prompt(colored("Enter method name (case-insensitive): ", Colors.BRIGHT_WHITE)).strip()
+        if not method_name: print(warning("No method name entered.")); _pause(1); return
 
         try:
             found_methods = self.explorer.search_method(method_name) # Assumes search_method is case-insensitive enough
 
             if not found_methods:
-                print(warning(f"No methods found matching '{method_name}'.")); input(colored("Press Enter...", Colors.BOLD)); return
+                print(warning(f"No methods found matching '{method_name}'.")); _prompt(colored("Press Enter...", Colors.BOLD)); return
 
             clear_screen(); print(menu_title(f"Method Search Results for '{method_name}'"))
             print(success(f"Found {len(found_methods)} matching method(s):\n"))
 
             method_map = {} # Map display index to method object for analysis selection
-            for i, m_obj in enumerate(found_methods):
-                comp_color = Colors.component_color(m_obj.parent_component.component_type)
-                method_str = colored(f"{m_obj.parent_component.name}.{m_obj.name}{m_obj.signature}", Colors.BRIGHT_GREEN)
-                comp_str = colored(f"in {m_obj.parent_component.fully_qualified_name}", comp_color)
-                print(menu_option(i+1, f"{method_str} {comp_str}"))
-                method_map[i+1] = m_obj # Store method object by index
+            lines = []
+            for i, m_obj in enumerate(found_methods, 1):
+                pc = m_obj.parent_component
+                lines.append(f"{C_BRIGHT_YELLOW}{i}{C_END} - {C_WHITE}{C_BRIGHT_GREEN}{pc.name}.{m_obj.name}{m_obj.signature}{C_END} "
+                             f"{component_ansi(pc.component_type)}in {pc.fully_qualified_name}{C_END}{C_END}")
+                method_map[i] = m_obj # Store method object by index
+            print("\n".join(lines))
 
             print(menu_option(0,"Back to Search Menu"))
 
             try:
-                choice_str = input(colored("\nSelect number to analyze (0=Back): ", Colors.BRIGHT_WHITE))
+                choice_str = _prompt(colored("\nSelect number to analyze (0=Back): ", Colors.BRIGHT_WHITE))
                 choice = int(choice_str)
                 if choice == 0: return # Go back
                 if 0 < choice <= len(found_methods):
                     selected_method = method_map[choice]
                     # Analyze the selected method (needs component context)
                     self._analyze_selected_method(selected_method, selected_method.parent_component)
-                else: print(error("Invalid selection number.")); time.sleep(1)
-            except ValueError: print(error("Invalid input. Please enter a number.")); time.sleep(1)
+                else: print(error("Invalid selection number.")); _pause(1)
+            except ValueError: print(error("Invalid input. Please enter a number.")); _pause(1)
 
         except Exception as e:
             logger.error(f"Error during method search for '{method_name}'", exc_info=True)
-            print(error(f"Could not perform method search: {e}")); time.sleep(1.5)
+            print(error(f"Could not perform method search: {e}")); _pause(1.5)
 
 
     def search_strings(self):
         clear_screen(); print(menu_title("Search Code (Strings/Identifiers)"))
-        search_term = input(colored("Enter text to search for (case-insensitive): ", Colors.BRIGHT_WHITE)).strip()
-        if not search_term: print(warning("No search term entered.")); time.sleep(1); return
+        search_term = _prompt(colored("Enter text to search for (case-insensitive, comma-separate multiple terms): ", Colors.BRIGHT_WHITE)).strip()
+        if not search_term: print(warning("No search term entered.")); _pause(1); return
 
         try:
             results = self.explorer.search_string(search_term) # Assumes search_string handles case
-            clear_screen(); print(menu_title(f"Code Search Results for '{search_term}'"))
-
             if not results:
-                print(warning(f"No matches found for '{search_term}'.")); input(colored("Press Enter...", Colors.BOLD)); return
-
-            # Group results by file path for display
-            results_by_file = defaultdict(list)
-            for r in results:
-                # Ensure path is present
-                if 'path' in r and 'original' in r:
-                    results_by_file[r['path']].append(r['original'])
-
-            num_files = len(results_by_file)
-            print(success(f"Found matches in {num_files} file(s):\n"));
-
-            display_count = 0
-            max_display_files = 25 # Limit number of files shown directly
-
-            for file_path, original_matches in sorted(results_by_file.items()):
-                if display_count >= max_display_files:
-                    print(f"\n... and {num_files - max_display_files} more files.")
-                    break
+                clear_screen(); print(menu_title(f"Code Search Results for '{search_term}'"))
+                print(warning(f"No matches found for '{search_term}'.")); _prompt(colored("Press Enter...", Colors.BOLD)); return
+
+            with batched_stdout() as out: # One write for the whole results screen
+                clear_screen(out); print(menu_title(f"Code Search Results for '{search_term}'"), file=out)
+                # Single pass: per-file Counter of matched text (unique values = its keys) plus the first FQN seen
+                results_by_file = {}
+                for r in results:
+                    # Ensure path is present
+                    if 'path' in r and 'original' in r:
+                        slot = results_by_file.get(r['path'])
+                        if slot is None: slot = results_by_file[r['path']] = {'uniq': Counter(), 'fqn': r.get('fqn')}
+                        elif slot['fqn'] is None: slot['fqn'] = r.get('fqn')
+                        slot['uniq'][r['original']] += 1
+
+                num_files = len(results_by_file)
+                print(success(f"Found matches in {num_files} file(s):\n"), file=out);
+
+                display_count = 0
+                max_display_files = 25 # Limit number of files shown directly
+
+                for file_path, slot in sorted(results_by_file.items()):
+                    if display_count >= max_display_files:
+                        print(f"\n... and {num_files - max_display_files} more files.", file=out)
+                        break
 
-                try: rel_path = os.path.relpath(file_path, self.explorer.project_path)
-                except ValueError: rel_path = file_path # Fallback for different drives etc.
+                    try: rel_path = _cached_relpath(file_path, self.explorer.project_path)
+                    except ValueError: rel_path = file_path # Fallback for different drives etc.
 
-                # Try to find the FQN associated with this file (useful for Java files)
-                fqn_found = next((r['fqn'] for r in results if r.get('path') == file_path and 'fqn' in r), None)
-                fqn_display = colored(f" ({fqn_found})", Colors.BRIGHT_GREEN) if fqn_found else ""
+                    # Try to find the FQN associated with this file (useful for Java files)
+                    fqn_found = slot['fqn']
+                    fqn_display = colored(f" ({fqn_found})", Colors.BRIGHT_GREEN) if fqn_found else ""
 
-                print(f"  - {colored(rel_path, Colors.BRIGHT_CYAN)}{fqn_display}")
+                    print(f"  - {colored(rel_path, Colors.BRIGHT_CYAN)}{fqn_display}", file=out)
 
-                # Show a preview of unique matches found in the file
-                unique_origs = sorted(list(set(original_matches)))
-                preview_matches = unique_origs[:5] # Show first few unique matches
-                preview_str = ", ".join(f"'{s[:40]}{'...' if len(s)>40 else ''}'" for s in preview_matches)
-                if len(unique_origs) > 5: preview_str += f", ... ({len(unique_origs) - 5} more unique)"
-                print(f"    Preview: {colored(preview_str, Colors.WHITE)}")
+                    # Show a preview of unique matches found in the file
+                    unique_origs = slot['uniq']
+                    preview_matches = heapq.nsmallest(5, unique_origs) # First few unique matches alphabetically, without sorting them all
+                    preview_str = ", ".join(f"'{s[:40]}{'...' if len(s)>40 else ''}'" for s in preview_matches)
+                    if len(unique_origs) > 5: preview_str += f", ... ({len(unique_origs) - 5} more unique)"
+                    print(f"    Preview: {colored(preview_str, Colors.WHITE)}", file=out)
 
-                display_count += 1
+                    display_count += 1
 
-            input(colored("\nPress Enter to return...", Colors.BOLD))
+            _prompt(colored("\nPress Enter to return...", Colors.BOLD))
 
         except Exception as e:
             logger.error(f"Error during string/code search for '{search_term}'", exc_info=True)
-            print(error(f"Could not perform search: {e}")); time.sleep(1.5)
+            print(error(f"Could not perform search: {e}")); _pause(1.5)
 
 
     def method_analysis_menu(self):
         while True:
-            clear_screen(); print(menu_title("Method Analysis Menu"));
-            print(menu_option(1,"Analyze by Searching Name")); print(menu_option(2,"Analyze by Entering Full Key")); print(menu_option(0,"Back to Main Menu"))
-            choice = input(colored("\nEnter choice: ", Colors.BRIGHT_WHITE)).strip()
+            clear_screen(); sys.stdout.write(_render_menu("Method Analysis Menu", self._METHOD_ANALYSIS_OPTIONS))
+            choice = _prompt(colored("\nEnter choice: ", Colors.BRIGHT_WHITE)).strip()
             if choice == '0': break
             elif choice == '1':
                 # This reuses the search_methods UI, which includes selection for analysis
                 self.search_methods()
             elif choice == '2':
                 self.analyze_method_by_key_input()
-            else: print(error("Invalid choice.")); time.sleep(1)
+            else: print(error("Invalid choice.")); _pause(1)
 
     def analyze_method_by_key_input(self):
         clear_screen(); print(menu_title("Analyze Method by Full Key"))
         print(info("Example key format: com.example.package.MyClass.myMethod(java.lang.String,int)"))
-        method_key = input(colored("\nEnter method key: ", Colors.BRIGHT_WHITE)).strip()
+        with _completion(self.explorer.methods): # Full method keys
+            method_key = _prompt(colored("\nEnter method key: ", Colors.BRIGHT_WHITE)).strip()
         if method_key:
             self.analyze_method(method_key) # Call the main analysis display
         else:
-            print(warning("No method key entered.")); time.sleep(1)
+            print(warning("No method key entered.")); _pause(1)
 
     def analyze_method(self, method_key):
         # This function retrieves analysis data and displays it.
@@ -515,7 +650,7 @@ class InteractiveSpringExplorer:
 
             if not flow_data:
                 # Error message already logged by analyze_method_flow if not found
-                print(error(f"Could not retrieve analysis data for key '{method_key}'. Check key format and logs.")); time.sleep(2); return
+                print(error(f"Could not retrieve analysis data for key '{method_key}'. Check key format and logs.")); _pause(2); return
 
             # Handle case where analyze_method_flow returned multiple matches
             if "multiple_matches" in flow_data:
@@ -541,12 +676,9 @@ class InteractiveSpringExplorer:
             if source_lines:
                 # Show limited number of lines directly, prompt to view full source?
                 max_lines_preview = 20
-                line_count = len(source_lines)
-                for i, line in enumerate(source_lines):
-                    if i >= max_lines_preview:
-                        print(colored(f"  ... ({line_count - max_lines_preview} more lines)", Colors.BRIGHT_BLACK))
-                        break
-                    print(f"  {line}") # Add line numbers? Maybe not needed here.
+                sys.stdout.write("".join(f"  {line}\n" for line in source_lines[:max_lines_preview])) # One write for the preview
+                if len(source_lines) > max_lines_preview:
+                    print(colored(f"  ... ({len(source_lines) - max_lines_preview} more lines)", Colors.BRIGHT_BLACK))
             else: print(colored("  (Source code not available or not found)", Colors.BRIGHT_BLACK))
 
             # Display Calls (Outgoing)
@@ -557,30 +689,24 @@ class InteractiveSpringExplorer:
             print(colored("\n--- Called By (Incoming) ---", Colors.BOLD))
             self._print_flow_hierarchy(flow_data.get("called_by", []), "  ", "parents") # Pass key 'parents'
 
-            input(colored("\nPress Enter to return...", Colors.BOLD))
+            _prompt(colored("\nPress Enter to return...", Colors.BOLD))
 
         except Exception as e:
             logger.error(f"Error displaying analysis for key '{method_key}'", exc_info=True)
-            print(error(f"Could not display method analysis: {e}")); time.sleep(2)
+            print(error(f"Could not display method analysis: {e}")); _pause(2)
 
 
     def _select_from_multiple_methods_for_analysis(self, original_key, method_objects):
         # Used when a key matches multiple methods (e.g., case-insensitive search)
         print(warning(f"Ambiguous key '{original_key}'. Found {len(method_objects)} potential matches:"))
 
-        method_keys_map = {} # Map display index to full method key string
+        method_keys = [None] * len(method_objects) # Full key per option (display number - 1); None marks an unusable option
         for i, m_obj in enumerate(method_objects):
             try:
-                # Reconstruct the key string for display and later use
-                param_types = []
-                if hasattr(m_obj, 'parameters') and m_obj.parameters:
-                    for p_sig in m_obj.parameters:
-                        type_part = p_sig.split()[0]; base_type = type_part.split('<')[0]
-                        param_types.append(base_type)
-                sig_key_part = f"({','.join(param_types)})"
-                full_key = f"{m_obj.parent_component.fully_qualified_name}.{m_obj.name}{sig_key_part}"
-
-                method_keys_map[i+1] = full_key # Store the constructed key
+                # The exact key the method is registered under; rebuilding it from the parameters drops generics
+                full_key = m_obj.canonical_key
+
+                method_keys[i] = full_key # Store the constructed key
                 # Display option
                 comp_color = Colors.component_color(m_obj.parent_component.component_type)
                 display_str = colored(full_key, comp_color)
@@ -589,88 +715,90 @@ class InteractiveSpringExplorer:
             except Exception as e: # Handle errors reconstructing key/display for a single method
                 logger.warning(f"Could not display option for method {m_obj}: {e}")
                 print(menu_option(i + 1, colored(f"Error displaying option {i+1}", Colors.RED)))
-                method_keys_map[i+1] = None # Mark as unusable
 
         print(menu_option(0, "Cancel Selection"))
 
         try:
-            choice_str = input(colored("\nSelect number to analyze: ", Colors.BRIGHT_WHITE))
+            choice_str = _prompt(colored("\nSelect number to analyze: ", Colors.BRIGHT_WHITE))
             choice = int(choice_str)
-            if choice == 0: print(info("Selection cancelled.")); time.sleep(1); return
+            if choice == 0: print(info("Selection cancelled.")); _pause(1); return
             if 0 < choice <= len(method_objects):
-                selected_key = method_keys_map.get(choice)
+                selected_key = method_keys[choice - 1]
                 if selected_key:
                     self.analyze_method(selected_key) # Re-call analysis with the specific key
                 else:
-                    print(error("Cannot analyze method due to previous error.")); time.sleep(1.5)
-            else: print(error("Invalid selection number.")); time.sleep(1)
-        except ValueError: print(error("Invalid input. Please enter a number.")); time.sleep(1)
+                    print(error("Cannot analyze method due to previous error.")); _pause(1.5)
+            else: print(error("Invalid selection number.")); _pause(1)
+        except ValueError: print(error("Invalid input. Please enter a number.")); _pause(1)
 
 
     def _print_flow_hierarchy(self, items, indent, child_key):
-        # Generic function to print call/caller trees
-        if not items: print(f"{indent}None found."); return
-
-        # Use box drawing characters for tree structure
-        connector = '├─ '
-        last_connector = '└─ '
-        vertical_pipe = '│  '
-        space_indent = '   '
-
-        num_items = len(items)
-        for i, item in enumerate(items):
-            is_last = (i == num_items - 1)
-            current_connector = last_connector if is_last else connector
-
-            # Extract display info safely using .get()
-            method_str = item.get('method', 'Unknown Method')
-            comp_name = item.get('component', 'Unknown Comp')
-            comp_type = item.get('component_type', '')
-            comp_color = Colors.component_color(comp_type)
-
-            # Format the output line
-            display_line = f"{indent}{current_connector}{colored(method_str, Colors.BRIGHT_GREEN)}"
-            display_line += f" {colored(f'({comp_name})', comp_color)}"
-            print(display_line)
-
-            # Recursively print children/parents if they exist
-            children_or_parents = item.get(child_key, [])
-            if children_or_parents:
-                next_indent = indent + (space_indent if is_last else vertical_pipe)
-                self._print_flow_hierarchy(children_or_parents, next_indent, child_key) # Recursive call
+        # Generic function to print call/caller trees. The whole tree is rendered into one buffer and written at once
+        buf = io.StringIO()
+        self._write_flow_hierarchy(buf.write, items, indent, child_key)
+        sys.stdout.write(buf.getvalue()); sys.stdout.flush()
+
+    @staticmethod
+    def _flow_rows(items, child_key):
+        # Normalizes one level of flow dicts to (method, component, component_type, children) tuples, so the walk
+        # below unpacks tuple slots instead of doing four dict.get() calls with defaults per node
+        return [(item.get('method', 'Unknown Method'), item.get('component', 'Unknown Comp'), item.get('component_type', ''), item.get(child_key) or ())
+                for item in items]
+
+    def _write_flow_hierarchy(self, write, items, indent, child_key):
+        if not items: write(indent + _TREE_EMPTY); return
+
+        # Explicit stack of (row, indent, is_last) instead of recursion: no frame per node and no recursion limit
+        # on deep trees. Siblings are pushed in reverse so they pop in display order (pre-order, like the recursive walk).
+        comp_labels = {} # (component, type) -> colored "(Component)"; the same few classes repeat across a tree
+        rows = self._flow_rows(items, child_key); last = len(rows) - 1
+        stack = [(row, indent, i == last) for i, row in reversed(list(enumerate(rows)))]
+        while stack:
+            (method_str, comp_name, comp_type, children), indent, is_last = stack.pop()
+
+            comp_label = comp_labels.get((comp_name, comp_type))
+            if comp_label is None: comp_label = comp_labels[comp_name, comp_type] = colored(f'({comp_name})', Colors.component_color(comp_type))
+
+            # Format the output line (method name colored inline with the bare escape codes)
+            write(f"{indent}{_TREE_CONNECTORS[is_last]}{C_BRIGHT_GREEN}{method_str}{C_END} {comp_label}\n")
+
+            # Queue children/parents (if any) so they are written directly below this node
+            if children:
+                next_indent = indent + _TREE_INDENTS[is_last]
+                rows = self._flow_rows(children, child_key); last = len(rows) - 1
+                stack.extend((row, next_indent, i == last) for i, row in reversed(list(enumerate(rows))))
 
 
     def file_git_operations_menu(self):
         while True:
-            clear_screen(); print(menu_title("File / Git Operations Menu"));
-            print(menu_option(1,"Convert Files/Directory to Text")); print(menu_option(2,"Browse Files Interactively")); print(menu_option(3,"Create Git Patch from Local Changes")); print(menu_option(0,"Back to Main Menu"))
-            choice = input(colored("\nEnter choice: ", Colors.BRIGHT_WHITE)).strip()
+            clear_screen(); sys.stdout.write(_render_menu("File / Git Operations Menu", self._FILE_GIT_OPTIONS))
+            choice = _prompt(colored("\nEnter choice: ", Colors.BRIGHT_WHITE)).strip()
             if choice == '0': break
             elif choice == '1': self.convert_files_menu()
             elif choice == '2':
                 # Reuse interactive browser from explorer
                 try: self.explorer.interactive_structure_browser()
-                except Exception as e: logger.error("Error during interactive browsing", exc_info=True); print(error(f"Browser error: {e}")); time.sleep(2)
+                except Exception as e: logger.error("Error during interactive browsing", exc_info=True); print(error(f"Browser error: {e}")); _pause(2)
             elif choice == '3': self.create_patch_menu()
-            else: print(error("Invalid choice.")); time.sleep(1)
+            else: print(error("Invalid choice.")); _pause(1)
 
     def convert_files_menu(self):
         clear_screen(); print(menu_title("Convert Files/Directory to Text"))
         print(info("Enter the index of a file or directory from the project structure."))
         print(info("You can find indices using the 'Project Structure' > 'View Full Tree' or 'Browse' options."))
-        node_index = input(colored("Enter index: ", Colors.BRIGHT_WHITE)).strip()
-        if not node_index: print(warning("No index entered.")); time.sleep(1); return
+        node_index = _prompt(colored("Enter index: ", Colors.BRIGHT_WHITE)).strip()
+        if not node_index: print(warning("No index entered.")); _pause(1); return
 
-        target_dir = input(colored("Enter output directory path (leave blank to save '.txt' next to original): ", Colors.BRIGHT_WHITE)).strip()
+        target_dir = _prompt(colored("Enter output directory path (leave blank to save '.txt' next to original): ", Colors.BRIGHT_WHITE)).strip()
 
-        print(info(f"Attempting to convert node '{node_index}' to text..."))
+        print(info(f"Attempting to convert node '{node_index}' to text..."), flush=True)
         try:
             ok, msg = self.explorer.convert_files_to_txt(node_index, target_dir if target_dir else None)
             print(success(msg) if ok else error(f"Conversion failed:\n{msg}"))
         except Exception as e:
             logger.error(f"Error during file conversion UI for index {node_index}", exc_info=True)
             print(error(f"An unexpected error occurred during conversion: {e}"))
-        input(colored("\nPress Enter to return...", Colors.BOLD))
+        _prompt(colored("\nPress Enter to return...", Colors.BOLD))
 
 
     def create_patch_menu(self):
@@ -679,17 +807,17 @@ class InteractiveSpringExplorer:
         print(info(f"Current Git repository: {self.explorer.project_path}"))
 
         # Check if it's actually a git repo before proceeding
-        git_dir = os.path.join(self.explorer.project_path, '.git')
-        if not os.path.isdir(git_dir):
+        try: is_git = stat.S_ISDIR(os.stat(self._git_dir).st_mode)
+        except OSError: is_git = False
+        if not is_git:
             print(error("\nThe specified project path does not appear to be a Git repository. Cannot create patch."));
-            input(colored("Press Enter to return...", Colors.BOLD)); return
+            _prompt(colored("Press Enter to return...", Colors.BOLD)); return
 
-        # Suggest a default filename
+        # Suggest a default filename. It is shown in the prompt below, so it is always needed (formatted once, here)
         default_filename = f"local_changes_{time.strftime('%Y%m%d_%H%M%S')}.patch"
-        default_path_display = os.path.join("", default_filename) # Display relative default
 
-        # Get output file path from user
-        path_input = input(colored(f"Enter output patch file path [Default: {default_path_display}]: ", Colors.BRIGHT_WHITE)).strip()
+        # Get output file path from user (the default is displayed relative, i.e. as the bare filename)
+        path_input = _prompt(colored(f"Enter output patch file path [Default: {default_filename}]: ", Colors.BRIGHT_WHITE)).strip()
         path_cleaned = path_input.strip('"').strip("'") # Remove potential quotes
 
         # Determine final output path
@@ -699,8 +827,8 @@ class InteractiveSpringExplorer:
             output_file_path = os.path.join(self.explorer.project_path, default_filename)
             print(info(f"Using default output path: {output_file_path}"))
         else:
-            # Check if user provided a directory or a full path
-            path_abs = os.path.abspath(path_cleaned)
+            # Check if user provided a directory or a full path; absolute input only needs normalizing (no getcwd)
+            path_abs = os.path.normpath(path_cleaned) if os.path.isabs(path_cleaned) else os.path.abspath(path_cleaned)
             if os.path.isdir(path_abs):
                 # User provided a directory, save with default name inside it
                 output_file_path = os.path.join(path_abs, default_filename)
@@ -710,35 +838,55 @@ class InteractiveSpringExplorer:
                 output_file_path = path_abs # Use the absolute path
 
         # Ask about including binary changes
-        include_binary_str = input(colored("Include binary file changes in patch? (y/N): ", Colors.BRIGHT_YELLOW)).strip().lower()
+        include_binary_str = _prompt(colored("Include binary file changes in patch? (y/N): ", Colors.BRIGHT_YELLOW)).strip().lower()
         include_binary = (include_binary_str == 'y')
 
-        print(info("Creating patch file..."))
+        print(info("Creating patch file..."), flush=True)
         try:
-            ok, msg = self.explorer.create_patch_from_local_changes(output_file_path, include_binary)
+            ok, msg = self._run_with_spinner(self.explorer.create_patch_from_local_changes, output_file_path, include_binary)
             print(success(msg) if ok else error(f"Patch creation failed: {msg}"))
+        except KeyboardInterrupt:
+            # The git run can't be interrupted from here; it keeps going on the worker thread (and is waited for on exit)
+            print(warning(f"\nStopped waiting. The patch is still being written in the background: {output_file_path}"))
         except Exception as e:
             logger.error(f"Error during patch creation UI for output {output_file_path}", exc_info=True)
             print(error(f"An unexpected error occurred during patch creation: {e}"))
 
-        input(colored("\nPress Enter to return...", Colors.BOLD))
+        _prompt(colored("\nPress Enter to return...", Colors.BOLD))
+
 
+    def _run_with_spinner(self, fn, *args):
+        # Runs fn on the reusable worker thread and animates a spinner until it finishes, so long git runs show
+        # progress and Ctrl+C is handled promptly. Non-tty output just waits for the result (no stray spinner chars).
+        if self._task_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._task_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spring-explorer-task")
+        future = self._task_executor.submit(fn, *args)
+        if sys.stdout.isatty():
+            frame = 0
+            try:
+                while not future.done():
+                    sys.stdout.write(f"\r{self._SPINNER_FRAMES[frame % len(self._SPINNER_FRAMES)]} "); sys.stdout.flush(); frame += 1
+                    try: future.result(timeout=0.05)
+                    except Exception: pass # Timeout, or fn failed (re-raised by the result() below)
+            finally:
+                sys.stdout.write("\r  \r"); sys.stdout.flush() # Also on Ctrl+C, so no spinner glyph is left behind
+        return future.result()
 
     def settings_menu(self):
         while True:
-            clear_screen(); print(menu_title("Settings & Debug Menu"));
-            print(menu_option(1,"Clear Cache & Re-analyze Project")); print(menu_option(2,"Debug: Show Annotations & Component Types")); print(menu_option(3,"Debug: List Java Parsing Errors")); print(menu_option(0,"Back to Main Menu"))
-            choice = input(colored("\nEnter choice: ", Colors.BRIGHT_WHITE)).strip()
+            clear_screen(); sys.stdout.write(_render_menu("Settings & Debug Menu", self._SETTINGS_OPTIONS))
+            choice = _prompt(colored("\nEnter choice: ", Colors.BRIGHT_WHITE)).strip()
             if choice == '0': break
             elif choice == '1':
-                confirm = input(warning("This will delete the cache and force a full re-analysis. Are you sure? (y/N): ")).strip().lower()
+                confirm = _prompt(warning("This will delete the cache and force a full re-analysis. Are you sure? (y/N): ")).strip().lower()
                 if confirm == 'y':
                     print(info("Clearing cache..."))
                     try:
                         ok, msg = self.explorer.clear_cache() # clear_cache now re-inits state internally
                         if ok:
                             print(success(msg))
-                            print(info("Re-analyzing project... This may take a moment."))
+                            print(info("Re-analyzing project... This may take a moment."), flush=True)
                             self.explorer.analyze_project() # Trigger re-analysis
                             print(success("Re-analysis complete."))
                         else: print(error(msg)) # Show error from clear_cache
@@ -747,69 +895,90 @@ class InteractiveSpringExplorer:
                         print(error(f"An error occurred: {e}"))
                 else:
                     print(info("Cache clear cancelled."))
-                input(colored("\nPress Enter to return...", Colors.BOLD))
+                _prompt(colored("\nPress Enter to return...", Colors.BOLD))
 
             elif choice == '2': self.debug_annotations_menu()
             elif choice == '3': self.list_parsing_errors()
-            else: print(error("Invalid choice.")); time.sleep(1)
+            else: print(error("Invalid choice.")); _pause(1)
+
+    def _cached_frame(self, name, source, render):
+        # Dirty-flag cache for long, static debug listings: the rendered text is reused until the collection it was
+        # built from is replaced (re-analysis) or changes size. Nothing is cached while analysis is still running.
+        if not self._analysis_done.is_set(): return render()
+        cached = self._frame_cache.get(name)
+        if cached is None or cached[0] is not source or cached[1] != len(source):
+            cached = self._frame_cache[name] = (source, len(source), render())
+        return cached[2]
+
+    @staticmethod
+    def _render_to_string(render_body):
+        buf = io.StringIO()
+        render_body(buf) # render_body prints into buf itself; sys.stdout is never swapped
+        return buf.getvalue()
 
     def debug_annotations_menu(self):
-        clear_screen(); print(menu_title("Debug: Annotations & Component Types"))
+        with batched_stdout() as out: # Whole summary goes out in one write
+            clear_screen(out); print(menu_title("Debug: Annotations & Component Types"), file=out)
+            out.write(self._cached_frame('annotations', self.explorer.components, lambda: self._render_to_string(self._print_annotations_summary)))
+        _prompt(colored("\nPress Enter to return...", Colors.BOLD))
+
+    def _print_annotations_summary(self, out):
         try:
             annotations_found, component_summary = self.explorer.debug_annotations()
 
-            print(colored(f"--- Unique Annotations Found ({len(annotations_found)}) ---", Colors.BOLD))
+            print(colored(f"--- Unique Annotations Found ({len(annotations_found)}) ---", Colors.BOLD), file=out)
             if annotations_found:
                 max_annotations_to_show = 50
-                for i, anno in enumerate(annotations_found):
-                    if i >= max_annotations_to_show:
-                        print(colored(f"  ... and {len(annotations_found) - max_annotations_to_show} more.", Colors.BRIGHT_BLACK))
-                        break
-                    print(f"  - {colored(anno, Colors.BRIGHT_YELLOW)}")
-            else: print(info("  No annotations collected (or none found)."))
+                print("\n".join(f"  - {C_BRIGHT_YELLOW}{anno}{C_END}" for anno in annotations_found[:max_annotations_to_show]), file=out)
+                if len(annotations_found) > max_annotations_to_show:
+                    print(colored(f"  ... and {len(annotations_found) - max_annotations_to_show} more.", Colors.BRIGHT_BLACK), file=out)
+            else: print(info("  No annotations collected (or none found)."), file=out)
 
 
-            print(colored(f"\n--- Component Type Summary ({len(component_summary)}) ---", Colors.BOLD))
+            print(colored(f"\n--- Component Type Summary ({len(component_summary)}) ---", Colors.BOLD), file=out)
             if component_summary:
-                # Sort by type name for consistent display
-                for comp_type, count in sorted(component_summary.items()):
-                    type_color = Colors.component_color(comp_type) # Get color for the type
-                    print(f"  - {colored(comp_type, type_color):<30}: {count} instance(s)") # Use color and padding
-            else: print(info("  No component types summarized (or no components found)."))
+                # Sort by type name for consistent display; padding applies to the colored string, as before
+                print("\n".join("  - %-30s: %d instance(s)" % (colored(comp_type, Colors.component_color(comp_type)), count)
+                                for comp_type, count in sorted(component_summary.items())), file=out)
+            else: print(info("  No component types summarized (or no components found)."), file=out)
 
         except Exception as e:
             logger.error("Error generating debug annotations/types summary", exc_info=True)
-            print(error(f"Could not generate debug summary: {e}"))
-
-        input(colored("\nPress Enter to return...", Colors.BOLD))
+            print(error(f"Could not generate debug summary: {e}"), file=out)
 
 
     def list_parsing_errors(self):
-        clear_screen(); print(menu_title("Debug: Java Parsing Errors"))
+        with batched_stdout() as out:
+            clear_screen(out); print(menu_title("Debug: Java Parsing Errors"), file=out)
+            out.write(self._cached_frame('parse_errors', self.explorer.parse_errors, lambda: self._render_to_string(self._print_parsing_errors)))
+        _prompt(colored("\nPress Enter to return...", Colors.BOLD))
+
+    def _print_parsing_errors(self, out):
         try:
             errors_list = self.explorer.get_parse_errors()
             if not errors_list:
-                print(success("No Java parsing errors were recorded during the last analysis."))
+                print(success("No Java parsing errors were recorded during the last analysis."), file=out)
             else:
                 num_errors = len(errors_list)
-                print(warning(f"{num_errors} file(s) encountered parsing errors:\n"))
+                print(warning(f"{num_errors} file(s) encountered parsing errors:\n"), file=out)
                 max_errors_to_show = 40
+                # Errored files live under the project root, so stripping "<root>/" gives the same result as relpath
+                prefix = os.path.join(os.path.abspath(self.explorer.project_path), '')
                 for i, (file_path, error_msg) in enumerate(errors_list):
                     if i >= max_errors_to_show:
-                        print(f"\n... and {num_errors - max_errors_to_show} more errors.")
+                        print(f"\n... and {num_errors - max_errors_to_show} more errors.", file=out)
                         break
-                    try: # Try to get relative path
-                        rel_path = os.path.relpath(file_path, self.explorer.project_path)
-                    except ValueError: rel_path = file_path # Fallback
+                    if file_path.startswith(prefix): rel_path = file_path[len(prefix):]
+                    else:
+                        try: rel_path = _cached_relpath(file_path, self.explorer.project_path)
+                        except ValueError: rel_path = file_path # Fallback (e.g. different drive on Windows)
 
-                    print(f"  File: {colored(rel_path, Colors.BRIGHT_RED)}")
-                    print(f"    Error: {colored(error_msg, Colors.WHITE)}")
-                    print("-" * 20) # Separator
+                    print(f"  File: {colored(rel_path, Colors.BRIGHT_RED)}", file=out)
+                    print(f"    Error: {colored(error_msg, Colors.WHITE)}", file=out)
+                    print("-" * 20, file=out) # Separator
 
         except Exception as e:
             logger.error("Error retrieving parsing errors", exc_info=True)
-            print(error(f"Could not retrieve parsing errors: {e}"))
-
-        input(colored("\nPress Enter to return...", Colors.BOLD))
+            print(error(f"Could not retrieve parsing errors: {e}"), file=out)
 
 # --- End Interactive CLI Class ---
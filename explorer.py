@@ -3,17 +3,20 @@ import subprocess
 import os
 import sys
 import pickle
+import hashlib
 import re
 import time
 import shutil
-from collections import defaultdict
+import threading
+from array import array
+from collections import defaultdict, deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # --- Library Imports with Checks ---
 try:
     import javalang
     # Import specific types needed for checks and processing
-    from javalang.tree import (MethodInvocation, TypeDeclaration, ClassDeclaration,
+    from javalang.tree import (TypeDeclaration, ClassDeclaration,
                                InterfaceDeclaration, EnumDeclaration, AnnotationDeclaration,
                                BasicType, Statement, MethodDeclaration, ConstructorDeclaration)
     from javalang.tokenizer import LexerError
@@ -30,19 +33,36 @@ except ImportError:
 
 # --- Local Imports ---
 from .models import SpringBootComponent, Field, Method, MethodCallVisitor
-from .utils import logger, Colors, colored # Import necessary items from utils
+from .utils import logger, Colors, colored, read_source, read_all # Import necessary items from utils
 # --- End Local Imports ---
 
 
 # --- Main Explorer Class ---
 class SpringBootExplorer:
     SPRING_ANNOTATIONS = ["@Controller", "@RestController", "@Service", "@Repository", "@Component", "@Configuration", "@Bean", "@Entity", "@Autowired", "@ControllerAdvice", "@RestControllerAdvice", "@RequestMapping", "@GetMapping", "@PostMapping", "@PutMapping", "@DeleteMapping", "@ExceptionHandler", "@PathVariable", "@RequestParam", "@RequestBody", "@ResponseBody", "@Valid", "@Qualifier", "@Scope", "@Lazy", "@Conditional", "@Profile", "@Primary", "@Order"]
+    # Lowercase annotation name -> canonical name ("restcontroller" -> "RestController"), built once for per-class lookups
+    SPRING_ANNOTATION_MAP = {sa[1:].lower(): sa[1:] for sa in SPRING_ANNOTATIONS}
+    # Simple names _resolve_type_name maps to java.lang / java.util without an import
+    JAVA_LANG_TYPES = frozenset({"String","Object","Integer","Boolean","Long","Double","Float","Character","Byte","Short","Void","Class","System","Math","Thread","Runnable","Exception","RuntimeException","Error","Throwable","Override","Deprecated","SuppressWarnings"})
+    JAVA_UTIL_TYPES = frozenset({"List","Map","Set","Collection","Optional", "ArrayList", "HashMap", "HashSet"})
+    DECLARATION_TYPES = {ClassDeclaration: "Class", InterfaceDeclaration: "Interface", EnumDeclaration: "Enum", AnnotationDeclaration: "Annotation"}
+    CACHE_VERSION = 10 # Bump whenever the cached data layout changes; older caches are then ignored and rebuilt
+    CACHE_RELEVANT_EXTENSIONS = ('.java', '.properties', '.yml', '.yaml', '.xml')
+    FILE_TYPES = {'java':'java','properties':'config','yml':'config','yaml':'config','xml':'xml','html':'web','css':'web','js':'web','jsp':'web','ts':'web','tsx':'web','jsx':'web','md':'doc','txt':'doc','png':'image','jpg':'image','jpeg':'image','gif':'image','svg':'image','sql':'sql', 'gradle':'build', 'mvn':'build'} # By lowercase extension, without the dot
     IGNORED_DIRS = {".git", "target", "build", "node_modules", ".idea", ".gradle", ".settings", ".classpath", ".project", "__pycache__", ".DS_Store", ".explorer_cache", "dist", "out"}
 
     def __init__(self, project_path):
         self.project_path = os.path.abspath(project_path)
         self.components={}; self.methods={}; self.index_structure={}; self.call_graph=nx.DiGraph();
-        self.string_index=defaultdict(list); self.package_structure=defaultdict(list); self.cache={}; self.parse_errors=[]
+        self.string_index=defaultdict(list); self.package_structure=defaultdict(list); self._packaged_fqns=set(); self.cache={}; self.parse_errors=[]
+        # string_index: lowercase term -> [(fqn, path, original text, 'identifier'|'literal')]; search_string returns them as dicts
+        self._resolve_cache=None # {(type name, context FQN): resolved name}, only set while the call graph is built
+        self._source_texts={} # {path: decoded source} kept from parsing for _build_string_index, which empties it
+        self._fqn_lower_index=[] # [(fqn.lower(), component)], rebuilt by _build_lookup_indexes after each analysis
+        self._component_types_sorted=[] # Distinct known component types, also rebuilt by _build_lookup_indexes
+        self.methods_by_name_lower=defaultdict(list) # method name.lower() -> [Method], also rebuilt by _build_lookup_indexes
+        self.files_by_type=defaultdict(list) # file type -> [file node] in tree order, filled by _build_project_structure (not cached)
+        self.files_total=0; self.files_parsed=0 # Parse progress, read by the CLI while analysis runs in a background thread
         self.cache_dir = os.path.join(self.project_path, ".explorer_cache")
         if not os.path.isdir(self.project_path): raise FileNotFoundError(f"Project path invalid: {self.project_path}")
         if not os.path.exists(self.cache_dir):
@@ -55,6 +75,7 @@ class SpringBootExplorer:
     def analyze_project(self):
         logger.info("Starting project analysis..."); t_start=time.time()
         if self._load_from_cache():
+             self._build_lookup_indexes()
              logger.info(f"Successfully loaded analysis results from cache in {time.time()-t_start:.2f}s"); return
         logger.info("Cache miss or invalid. Performing full analysis...");
         self._build_project_structure()
@@ -63,57 +84,94 @@ class SpringBootExplorer:
         self._build_call_graph()
         self._build_string_index()
         self._save_to_cache()
+        self._build_lookup_indexes()
         logger.info(f"Project analysis completed in {time.time()-t_start:.2f}s. Components: {len(self.components)}, Methods: {len(self.methods)}.")
         if self.parse_errors: logger.warning(f"Encountered {len(self.parse_errors)} parsing errors during analysis.")
 
+    def _build_lookup_indexes(self):
+        # Precompute lowercase keys once so repeated UI searches don't re-lower every FQN per query
+        # Ordered by FQN so search_component results come back display-ready
+        self._fqn_lower_index = [(fqn.lower(), self.components[fqn]) for fqn in sorted(self.components)]
+        self.methods_by_name_lower = defaultdict(list) # Overloads/same-named methods share a bucket, in registration order
+        for m in self.methods.values(): self.methods_by_name_lower[m.name.lower()].append(m)
+        self._component_types_sorted = sorted({c.component_type for c in self.components.values() if c.component_type and c.component_type != "Unknown"})
+
     def _build_project_structure(self):
         logger.info("Building project file structure index..."); self.index_structure={"index":"0", "path":self.project_path, "name":os.path.basename(self.project_path), "type":"directory", "children":[]}
+        self.files_by_type = defaultdict(list)
         self._traverse_directory(self.project_path, self.index_structure["children"], "")
         logger.info("Project structure index built.")
 
     def _traverse_directory(self, directory, children_list, parent_idx):
-        try:
-            items = sorted(os.listdir(directory))
-        except Exception as e:
-            logger.debug(f"Cannot list directory {directory}: {e}"); return
         # Skip ignored directories by basename
         if os.path.basename(directory) in self.IGNORED_DIRS or directory == self.cache_dir:
              logger.debug(f"Skipping ignored directory: {directory}")
              return
-
-        for i, item in enumerate(items):
-            path = os.path.join(directory, item); idx = f"{parent_idx}.{i+1}" if parent_idx else f"{i+1}"
-            try:
-                # Check if path exists and handle potential race conditions/errors
-                if not os.path.exists(path): continue
-                is_dir = os.path.isdir(path); is_file = os.path.isfile(path)
-            except OSError as e:
-                 logger.debug(f"OS error accessing {path}: {e}"); continue
-
-            if is_dir:
-                # Recurse into non-ignored directories
-                if os.path.basename(path) not in self.IGNORED_DIRS and path != self.cache_dir:
-                    entry={"index":idx,"path":path,"name":item,"type":"directory","children":[]}
-                    children_list.append(entry)
-                    self._traverse_directory(path, entry["children"], idx)
-            elif is_file:
-                 # Add file entry
-                 children_list.append({"index":idx,"path":path,"name":item,"type":self._determine_file_type(item)})
+        # Iterative pre-order walk: each stack frame is (remaining entries of a directory, its children list, its index).
+        # Descending into a subdirectory pauses the parent's iterator, so nodes (and files_by_type) come out in the same
+        # order as the recursive walk, without recursion depth limits.
+        files_by_type = self.files_by_type
+        stack = [(enumerate(self._list_directory(directory), 1), children_list, parent_idx)]
+        while stack:
+            entries, children_list, parent_idx = stack[-1]
+            for i, entry in entries:
+                item = entry.name; path = entry.path; idx = f"{parent_idx}.{i}" if parent_idx else f"{i}"
+                try:
+                    # Follows symlinks like isdir/isfile did; broken links are neither and get skipped
+                    is_dir = entry.is_dir(); is_file = not is_dir and entry.is_file()
+                except OSError as e:
+                     logger.debug(f"OS error accessing {path}: {e}"); continue
+
+                if is_dir:
+                    # Descend into non-ignored directories (ignored ones are pruned here, before they are ever listed)
+                    if item not in self.IGNORED_DIRS and path != self.cache_dir:
+                        node={"index":idx,"path":path,"name":item,"type":"directory","children":[]}
+                        children_list.append(node)
+                        stack.append((enumerate(self._list_directory(path), 1), node["children"], idx)); break
+                elif is_file:
+                     # Add file entry (also collected per type, so parsing needs no second walk over the tree)
+                     node={"index":idx,"path":path,"name":item,"type":self._determine_file_type(item)}
+                     children_list.append(node); files_by_type[node["type"]].append(node)
+            else: stack.pop() # Directory exhausted
+
+    @staticmethod
+    def _list_directory(directory):
+        try:
+            # scandir entries carry the file type from the directory listing, so no extra exists/isdir/isfile stat calls
+            with os.scandir(directory) as it: return sorted(it, key=lambda e: e.name)
+        except Exception as e:
+            logger.debug(f"Cannot list directory {directory}: {e}"); return []
 
     def _determine_file_type(self, filename):
-        ext = os.path.splitext(filename)[1].lower()
-        types={'.java':'java','.properties':'config','.yml':'config','.yaml':'config','.xml':'xml','.html':'web','.css':'web','.js':'web','.jsp':'web','.ts':'web','.tsx':'web','.jsx':'web','.md':'doc','.txt':'doc','.png':'image','.jpg':'image','.jpeg':'image','.gif':'image','.svg':'image','.sql':'sql', '.gradle':'build', '.mvn':'build'} # Added build types
-        return types.get(ext, 'other')
+        # rpartition instead of os.path.splitext; like splitext, a dot-file such as '.java' has no extension
+        head, dot, ext = filename.rpartition('.')
+        if not dot or not head.strip('.'): return 'other'
+        return self.FILE_TYPES.get(ext.lower(), 'other')
 
     def _parse_java_files(self):
-        logger.info("Searching for Java files..."); files = self._find_files_by_type(self.index_structure, "java")
+        files = self.files_by_type.get("java") # Collected while the structure index was built
         if not files: logger.warning("No Java files found in the project structure."); return
 
-        num_files = len(files)
-        use_parallel = num_files > 50 # Threshold for parallel parsing
-        parser = self._parse_java_files_parallel if use_parallel else self._parse_java_files_sequential
-        logger.info(f"Starting parsing of {num_files} Java files ({'parallel' if use_parallel else 'sequential'})...")
-        parser(files); logger.info("Java file parsing attempt finished.")
+        num_files = len(files); self.files_parsed = 0; self.files_total = num_files # Structure index is complete from here on
+        # Files whose content is unchanged since the last run reuse their previous parse results (see Parse Cache below)
+        parse_cache = self._load_parse_cache()
+        stale, fresh_entries, new_stamps = self._split_by_parse_cache(files, parse_cache)
+        for f_info in files:
+            entry = fresh_entries.get(f_info["path"])
+            if entry is not None: self._merge_cached_parse(entry[2], f_info["index"]); self.files_parsed += 1
+        if fresh_entries: logger.info(f"Reused cached parse results for {len(fresh_entries)} unchanged Java files.")
+
+        if stale:
+            # Threshold for parallel parsing; below it process/thread startup costs more than it saves.
+            # javalang is pure Python, so only processes give real parallelism; threads remain for single-CPU hosts.
+            num_stale = len(stale)
+            if num_stale <= 50: mode, parser = 'sequential', self._parse_java_files_sequential
+            elif (os.cpu_count() or 1) > 1: mode, parser = 'process pool', self._parse_java_files_processes
+            else: mode, parser = 'parallel', self._parse_java_files_parallel
+            logger.info(f"Starting parsing of {num_stale} Java files ({mode})...")
+            parser(stale); logger.info("Java file parsing attempt finished.")
+            if fresh_entries: self._restore_file_order(files) # Cached and new results were merged out of file order
+        self._save_parse_cache(files, stale, fresh_entries, new_stamps, parse_cache)
 
     def _parse_java_files_sequential(self, files):
         total = len(files)
@@ -126,6 +184,7 @@ class SpringBootExplorer:
                 # Catch unexpected errors during the parse call itself
                 logger.error(f"Unhandled error during parsing of {f_info['path']}: {e}", exc_info=True)
                 self.parse_errors.append((f_info['path'], f"Unhandled parsing exception: {e}"))
+            self.files_parsed += 1
 
     def _parse_java_files_parallel(self, files):
         max_workers = min(12, (os.cpu_count() or 1) + 4) # Limit threads
@@ -138,7 +197,7 @@ class SpringBootExplorer:
             # Process results as they complete
             for future in as_completed(future_to_file):
                 f_info = future_to_file[future]
-                processed_count += 1
+                processed_count += 1; self.files_parsed += 1 # Only this thread writes it
                 try:
                     future.result() # Raise exceptions from the thread, if any
                 except Exception as e:
@@ -151,47 +210,60 @@ class SpringBootExplorer:
                 # if processed_count % 100 == 0: logger.info(f"Parsed {processed_count}/{total} files...")
 
 
-    def _find_files_by_type(self, node, file_type):
-        results = [];
-        if node is None: return results # Safety check
-
-        if node.get("type") == file_type and 'path' in node: # Ensure it's the right type and has a path
-             results.append(node)
-
-        # Recursively search children if they exist
-        for child in node.get("children", []) or []: # Safe iteration
-             if child: # Ensure child is not None
-                 results.extend(self._find_files_by_type(child, file_type))
-        return results
+    def _parse_java_files_processes(self, files):
+        # Each worker parses with its own bare explorer and ships back only that file's components/methods/errors.
+        # executor.map yields in submission order, so merged results are ordered like a sequential run.
+        from concurrent.futures import ProcessPoolExecutor
+        max_workers = min(len(files), os.cpu_count() or 1)
+        chunksize = max(1, len(files) // (4 * max_workers)) # Few large batches amortize IPC; 4 per worker keeps them balanced
+        merged = 0
+        try:
+            mp_context = self._process_pool_context()
+            # Workers of a background analysis stay silent: their log lines would land on the interactive prompt, and
+            # each parse failure still reaches parse_errors through the merged results
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context, initializer=_init_parse_worker, initargs=(self.project_path, mp_context is not None)) as executor:
+                for result in executor.map(_parse_java_file_in_worker, [f["path"] for f in files], [f["index"] for f in files], chunksize=chunksize):
+                    self._merge_parse_result(*result); merged += 1; self.files_parsed += 1
+        except Exception as e: # e.g. BrokenProcessPool, or process creation not permitted in this environment
+            logger.warning(f"Process pool parsing failed ({type(e).__name__}: {e}). Parsing remaining {len(files) - merged} files with threads.")
+            self._parse_java_files_parallel(files[merged:])
+
+    @staticmethod
+    def _process_pool_context():
+        # None (the platform default start method) on the main thread. When analysis runs in a background thread
+        # (the interactive CLI), a forked child would inherit locks held by the other threads, e.g. the main thread
+        # blocked reading stdin, so workers are started fresh with forkserver (or spawn where that is unavailable).
+        if threading.current_thread() is threading.main_thread(): return None
+        import multiprocessing
+        return multiprocessing.get_context("forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+
+    def _merge_parse_result(self, components, methods, parse_errors, package_structure):
+        self.components.update(components); self.methods.update(methods); self.parse_errors.extend(parse_errors)
+        for fqns in package_structure.values():
+            for fqn in fqns: self._add_to_package_structure(fqn)
 
     def _parse_java_file(self, file_path, index):
-        content = None; encodings = ['utf-8', 'latin-1', 'cp1252']
-        read_success = False
-        for enc in encodings:
-            try:
-                with open(file_path, 'r', encoding=enc) as f: content = f.read(); read_success = True; break
-            except UnicodeDecodeError: continue # Try next encoding
-            except FileNotFoundError: logger.warning(f"File not found during parsing: {file_path}"); self.parse_errors.append((file_path, "File not found")); return
-            except Exception as e: logger.warning(f"Error reading {file_path} with encoding {enc}: {e}"); self.parse_errors.append((file_path, f"Read error ({enc}): {e}")); return # Stop trying encodings on error
-        if not read_success: logger.warning(f"Could not read file {file_path} with tested encodings."); self.parse_errors.append((file_path,"Read encoding error")); return
+        # One open + read; the utf-8/latin-1/cp1252 fallbacks are tried on the in-memory bytes
+        try: content = read_source(file_path)
+        except FileNotFoundError: logger.warning(f"File not found during parsing: {file_path}"); self.parse_errors.append((file_path, "File not found")); return
+        except Exception as e: logger.warning(f"Error reading {file_path}: {e}"); self.parse_errors.append((file_path, f"Read error: {e}")); return
+        if content is None: logger.warning(f"Could not read file {file_path} with tested encodings."); self.parse_errors.append((file_path,"Read encoding error")); return
+        self._source_texts[file_path] = content # The string index scans the same text, so it doesn't read the file again
 
         try:
             tree = javalang.parse.parse(content)
+            source_lines = content.splitlines() # Split once per file; every method/constructor slices its body from this
             # SAFE: Check package exists before accessing name
             pkg_name = tree.package.name if tree.package and hasattr(tree.package, 'name') else ""
             # SAFE: Ensure imports is iterable
-            imports_list = [imp.path for imp in tree.imports or [] if imp and hasattr(imp, 'path')]
+            imports_list = [sys.intern(imp.path) for imp in tree.imports or () if imp and hasattr(imp, 'path')] # Same FQNs recur across files
 
-            # Process top-level type declarations using safe iteration
-            for path, node in tree.filter(TypeDeclaration):
-                 # SAFE: Check node is not None
-                 if node is None: continue
-                 # SAFE: Ensure path is iterable (though filter usually yields tuples)
-                 if not isinstance(path, (list, tuple)): path = []
-
-                 # Check if it's a top-level declaration (not nested within another TypeDeclaration)
-                 if not any(isinstance(p, TypeDeclaration) for p in path):
-                     self._process_type_declaration(node, pkg_name, imports_list, content, file_path, index)
+            # Process top-level type declarations; tree.types holds exactly these, so no walk over the whole AST.
+            # Nested types are reached by _process_type_declaration's own recursion.
+            for node in tree.types or ():
+                 # SAFE: Check node is a type declaration
+                 if isinstance(node, TypeDeclaration):
+                     self._process_type_declaration(node, pkg_name, imports_list, source_lines, file_path, index)
 
         except (LexerError, JavaSyntaxError, IndexError, TypeError, AttributeError, RecursionError) as e:
             line = e.pos.line if hasattr(e,'pos') and e.pos else '?'; err_type=type(e).__name__
@@ -207,7 +279,7 @@ class SpringBootExplorer:
             self.parse_errors.append((file_path, f"Unexpected parsing error: {type(e).__name__}-{e}"))
 
 
-    def _process_type_declaration(self, node, context_name, imports, content, file_path, index):
+    def _process_type_declaration(self, node, context_name, imports, source_lines, file_path, index):
         # SAFE: Check if node is None before accessing attributes
         if node is None:
              logger.warning(f"Skipping None node in _process_type_declaration for {file_path}")
@@ -216,15 +288,15 @@ class SpringBootExplorer:
         name = node.name if hasattr(node, 'name') else 'UnnamedType'
         # Determine Fully Qualified Name (FQN)
         fqn_base = f"{context_name}.{name}" if context_name else name
-        fqn = f"{context_name}${name}" if '$' in context_name else fqn_base # Simple inner class check
+        fqn = sys.intern(f"{context_name}${name}" if '$' in context_name else fqn_base) # Simple inner class check; interned so imports/extends naming it share the object
 
         comp_type = self._determine_component_type(node)
-        # SAFE: Add 'or []' and check annotation name exists
-        annos = [f"@{a.name}" for a in getattr(node, 'annotations', []) or [] if hasattr(a, 'name')]
+        # SAFE: Add 'or ()' and check annotation name exists
+        annos = self._annotation_names(getattr(node, 'annotations', None))
         comp = SpringBootComponent(name, file_path, comp_type, index)
-        comp.imports=imports; comp.annotations=annos; comp.package=context_name.split('$')[0] if '$' in context_name else context_name; comp.fully_qualified_name=fqn
-        # SAFE: Add 'or []' and check type parameter name
-        comp.generics=[p.name for p in getattr(node,'type_parameters', []) or [] if hasattr(p, 'name')];
+        comp.imports=imports; comp.annotations=annos; comp.package=sys.intern(context_name.split('$')[0] if '$' in context_name else context_name); comp.fully_qualified_name=fqn
+        # SAFE: Add 'or ()' and check type parameter name
+        comp.generics=[p.name for p in getattr(node,'type_parameters', None) or () if hasattr(p, 'name')];
 
         ext = getattr(node,'extends',None); imp = getattr(node,'implements',None)
 
@@ -236,47 +308,64 @@ class SpringBootExplorer:
             imp_list = imp if isinstance(imp, list) else ([imp] if imp else [])
             comp.implements = [self._format_type(i) for i in imp_list if i] # Filter None elements
 
-        # SAFE: Use 'or []' and check elements when processing fields, methods, constructors
-        if hasattr(node,'fields'): [self._process_field(f, comp) for f in node.fields or [] if f]
-        if hasattr(node,'methods'): [self._process_method(m, comp, content) for m in node.methods or [] if m]
-        if hasattr(node,'constructors'): [self._process_constructor(c, comp, content) for c in node.constructors or [] if c]
+        # SAFE: Use 'or ()' and check elements when processing fields, methods, constructors
+        # Plain loops: these run for their side effects, so no throwaway list of None results is built
+        if hasattr(node,'fields'):
+            for f in node.fields or ():
+                if f: self._process_field(f, comp)
+        if hasattr(node,'methods'):
+            for m in node.methods or ():
+                if m: self._process_method(m, comp, source_lines)
+        if hasattr(node,'constructors'):
+            for c in node.constructors or ():
+                if c: self._process_constructor(c, comp, source_lines)
 
         # Store/Update component
         self.components[fqn] = comp
-        if '.' in fqn and '$' not in fqn: # Add top-level FQN to package structure
-            pkg_name = '.'.join(fqn.split('.')[:-1])
-            # Ensure package_structure entry is a list
-            if not isinstance(self.package_structure.get(pkg_name), list):
-                 self.package_structure[pkg_name] = []
-            if fqn not in self.package_structure[pkg_name]:
-                 self.package_structure[pkg_name].append(fqn)
+        self._add_to_package_structure(fqn)
 
         # Recurse for inner types
         if hasattr(node, 'body'):
-            # SAFE: Add 'or []' when iterating through body members
-            inner_type_decls = [m for m in node.body or [] if isinstance(m, TypeDeclaration)]
+            # SAFE: Add 'or ()' when iterating through body members
+            inner_type_decls = [m for m in node.body or () if isinstance(m, TypeDeclaration)]
             for idx, member in enumerate(inner_type_decls):
                  if member: # SAFE: Check member is not None before recursing
-                     self._process_type_declaration(member, fqn, imports, content, file_path, f"{index}.i{idx+1}") # Use current FQN as context
+                     self._process_type_declaration(member, fqn, imports, source_lines, file_path, f"{index}.i{idx+1}") # Use current FQN as context
+
+
+    def _add_to_package_structure(self, fqn):
+        # _packaged_fqns mirrors every FQN already listed, so the duplicate check is a set probe, not a list scan
+        if '.' in fqn and '$' not in fqn and fqn not in self._packaged_fqns: # Add top-level FQN to package structure
+            pkg_name = fqn.rpartition('.')[0]
+            # Ensure package_structure entry is a list
+            if not isinstance(self.package_structure.get(pkg_name), list):
+                 self.package_structure[pkg_name] = []
+            self.package_structure[pkg_name].append(fqn); self._packaged_fqns.add(fqn)
+
+
+    # Annotation, modifier and type strings repeat across the whole project ("@Autowired", "public", "String").
+    # Parsed token values are fresh objects per file, so they are interned to share one copy in memory and in pickles.
+    @staticmethod
+    def _annotation_names(annotations):
+        return [sys.intern(f"@{a.name}") for a in annotations or () if hasattr(a, 'name')]
+
+    @staticmethod
+    def _modifier_names(modifiers):
+        return [sys.intern(m) for m in modifiers or ()]
 
 
     def _determine_component_type(self, node):
         # SAFE: Check node before type check
         if node is None: return "Unknown"
-        # Use specific javalang types for clarity
-        type_map = {ClassDeclaration:"Class", InterfaceDeclaration:"Interface", EnumDeclaration:"Enum", AnnotationDeclaration:"Annotation"}
-        comp_type = type_map.get(type(node), "Unknown")
-
         # Check annotations for Spring stereotypes
-        # SAFE: Use getattr with default and 'or []' for annotations
-        for anno in getattr(node, 'annotations', []) or []:
+        # SAFE: Use getattr with default and 'or ()' for annotations
+        spring_map = self.SPRING_ANNOTATION_MAP
+        for anno in getattr(node, 'annotations', None) or ():
              # SAFE: Check anno and anno.name exist
              if anno and hasattr(anno, 'name') and anno.name:
-                 anno_name_lower = anno.name.lower()
-                 for sa in self.SPRING_ANNOTATIONS:
-                     if anno_name_lower == sa[1:].lower(): # Compare lowercase annotation name
-                         return sa[1:] # Return canonical Spring name (e.g., "Service")
-        return comp_type
+                 sa = spring_map.get(anno.name.lower())
+                 if sa: return sa # Canonical Spring name (e.g., "Service")
+        return self.DECLARATION_TYPES.get(type(node), "Unknown")
 
 
     def _format_type(self, node):
@@ -293,13 +382,14 @@ class SpringBootExplorer:
         # Handle javalang type nodes
         name = getattr(node,'name',None)
         if name:
-            base=name; sub=getattr(node,'sub_type',None); args=getattr(node,'arguments',None); dims=getattr(node,'dimensions',None)
+            sub=getattr(node,'sub_type',None); args=getattr(node,'arguments',None); dims=getattr(node,'dimensions',None)
+            if not (sub or args or dims): return sys.intern(name) # Plain `String`/`Long`/`int`: the bulk of all calls
+            base=name
             if sub: base += '.'+self._format_type(sub) # Recursive call
-            # SAFE: Add 'or []' for arguments and check argument 'a'
-            if args: base += f"<{','.join([(self._format_type(a.type) if hasattr(a,'type') and a.type else (self._format_type(a.pattern_type) if hasattr(a,'pattern_type') else (getattr(a,'name','?') or '?'))) for a in args or [] if a])}>"
-            # SAFE: Add 'or []' for dimensions
-            if dims: base += '[]'*len(dims or [])
-            return base
+            # SAFE: Check argument 'a'
+            if args: base += f"<{','.join([self._format_type_argument(a) for a in args if a])}>"
+            if dims: base += '[]'*len(dims)
+            return sys.intern(base)
 
         # Check for basic types like 'int', 'float' etc.
         if isinstance(node, BasicType):
@@ -309,29 +399,38 @@ class SpringBootExplorer:
         return getattr(node,'value',str(node))
 
 
+    def _format_type_argument(self, arg):
+        # One generic argument: its type, else the wildcard/pattern type, else its name
+        arg_type = getattr(arg,'type',None)
+        if arg_type: return self._format_type(arg_type)
+        if hasattr(arg,'pattern_type'): return self._format_type(arg.pattern_type)
+        return getattr(arg,'name','?') or '?'
+
+
     def _process_field(self, node, comp):
         # SAFE: Check node is not None
         if node is None: return
         type_s=self._format_type(node.type) # Format the base type
-        # SAFE: Use 'or []' for modifiers and annotations, check annotation name
-        mods=list(node.modifiers or [])
-        annos=[f"@{a.name}" for a in node.annotations or [] if hasattr(a, 'name')]
+        # SAFE: Use 'or ()' for modifiers and annotations, check annotation name
+        mods=self._modifier_names(node.modifiers)
+        annos=self._annotation_names(node.annotations)
 
-        # SAFE: Use 'or []' for declarators and check declarator 'decl'
-        for decl in node.declarators or []:
+        # SAFE: Use 'or ()' for declarators and check declarator 'decl'
+        for decl in node.declarators or ():
             if decl is None: continue
             name=decl.name
             # SAFE: Check dimensions exist and are iterable before len()
             dims = decl.dimensions or []
-            type_f=type_s+('[]'*len(dims)) # Append array dimensions if any
+            type_f=sys.intern(type_s+'[]'*len(dims)) if dims else type_s # Append array dimensions if any
             field=Field(name,type_f,mods,comp); field.annotations=annos
             # SAFE: Ensure fields dict exists
             if comp.fields is None: comp.fields = {}
             comp.fields[name]=field
 
 
-    def _extract_source_lines(self, node, source_code):
-        lines=source_code.splitlines(); start, end = -1,-1
+    def _extract_source_lines(self, node, lines):
+        # lines: the file's content.splitlines(), computed once by _parse_java_file
+        start, end = -1,-1
         # SAFE: Check node exists before accessing position
         if node and hasattr(node,'position') and node.position:
              start=node.position.line
@@ -339,8 +438,8 @@ class SpringBootExplorer:
              return [],"",-1,-1 # Cannot determine lines without position
 
         if start > 0:
-            level, idx, found_start, end_line_calc = 0, start - 1, False, start
-            while idx < len(lines):
+            level, idx, found_start, end_line_calc = 0, start - 1, False, start; n_lines = len(lines)
+            while idx < n_lines:
                 line = lines[idx]; open_b = line.count('{'); close_b = line.count('}')
                 if not found_start:
                     # Find the line where the body likely starts (contains '{')
@@ -378,13 +477,13 @@ class SpringBootExplorer:
         return [],"",-1,-1 # Return default if lines couldn't be extracted
 
 
-    def _process_method(self, node, comp, content):
+    def _process_method(self, node, comp, source_lines):
         # SAFE: Check node is not None
         if node is None: return
         name=node.name if hasattr(node, 'name') else 'UnnamedMethod'
         params, types=[],[]
-        # SAFE: Use 'or []' for parameters and check parameter 'p'
-        for p in node.parameters or []:
+        # SAFE: Use 'or ()' for parameters and check parameter 'p'
+        for p in node.parameters or ():
              if p is None: continue
              param_type_str = self._format_type(p.type)
              param_name = p.name or '?' # Handle unnamed parameters
@@ -393,15 +492,15 @@ class SpringBootExplorer:
              types.append(f"{param_type_str}{varargs_suffix}")
 
         sig_disp=f"({', '.join(params)})"; sig_key=f"({','.join(types)})"
-        lines, _, start, end = self._extract_source_lines(node, content)
+        lines, _, start, end = self._extract_source_lines(node, source_lines)
 
         m = Method(name, sig_disp, "", comp) # Body not stored directly
-        # SAFE: Use 'or []' for modifiers, annotations, throws
-        m.modifiers=list(node.modifiers or [])
+        # SAFE: Use 'or ()' for modifiers, annotations, throws
+        m.modifiers=self._modifier_names(node.modifiers)
         m.return_type=self._format_type(node.return_type) or "void"
         m.parameters=params; m.source_lines=lines; m.start_line=start; m.end_line=end
-        m.annotations=[f"@{a.name}" for a in node.annotations or [] if hasattr(a, 'name')]
-        m.exceptions=[self._format_type(e) for e in node.throws or [] if e] # Check 'e'
+        m.annotations=self._annotation_names(node.annotations)
+        m.exceptions=[self._format_type(e) for e in node.throws or () if e] # Check 'e'
 
         # SAFE: Check body exists and iterate safely
         if hasattr(node, 'body') and node.body:
@@ -421,16 +520,16 @@ class SpringBootExplorer:
         # SAFE: Ensure methods dict exists
         if self.methods is None: self.methods = {}
         if comp.methods is None: comp.methods = {}
-        self.methods[key]=m; comp.methods[f"{name}{sig_disp}"]=m
+        m.canonical_key=key; self.methods[key]=m; comp.methods[f"{name}{sig_disp}"]=m
 
 
-    def _process_constructor(self, node, comp, content):
+    def _process_constructor(self, node, comp, source_lines):
         # SAFE: Check node is not None
         if node is None: return
         name="<init>"; disp_name=comp.name if hasattr(comp, 'name') else 'UnnamedClass'
         params, types=[],[]
-        # SAFE: Use 'or []' for parameters and check 'p'
-        for p in node.parameters or []:
+        # SAFE: Use 'or ()' for parameters and check 'p'
+        for p in node.parameters or ():
              if p is None: continue
              param_type_str = self._format_type(p.type)
              param_name = p.name or '?'
@@ -439,15 +538,15 @@ class SpringBootExplorer:
              types.append(f"{param_type_str}{varargs_suffix}")
 
         sig_disp=f"({', '.join(params)})"; sig_key=f"({','.join(types)})"
-        lines, _, start, end = self._extract_source_lines(node, content)
+        lines, _, start, end = self._extract_source_lines(node, source_lines)
         # Use Method class to store constructor info, name is '<init>'
         c = Method(name, sig_disp, "", comp)
-        # SAFE: Use 'or []' for modifiers, annotations, throws
-        c.modifiers=list(node.modifiers or [])
+        # SAFE: Use 'or ()' for modifiers, annotations, throws
+        c.modifiers=self._modifier_names(node.modifiers)
         c.parameters=params
         c.source_lines=lines; c.start_line=start; c.end_line=end
-        c.annotations=[f"@{a.name}" for a in node.annotations or [] if hasattr(a, 'name')]
-        c.exceptions=[self._format_type(e) for e in node.throws or [] if e];
+        c.annotations=self._annotation_names(node.annotations)
+        c.exceptions=[self._format_type(e) for e in node.throws or () if e];
         c.return_type=disp_name # Constructor returns instance of the class
 
         # SAFE: Check body exists and iterate safely
@@ -467,7 +566,7 @@ class SpringBootExplorer:
         # SAFE: Ensure methods dict exists
         if self.methods is None: self.methods = {}
         if comp.methods is None: comp.methods = {}
-        self.methods[key]=c; comp.methods[f"{disp_name}{sig_disp}"]=c # Use ClassName(params) for key in component
+        c.canonical_key=key; self.methods[key]=c; comp.methods[f"{disp_name}{sig_disp}"]=c # Use ClassName(params) for key in component
 
 
     def _build_component_relationships(self):
@@ -490,6 +589,16 @@ class SpringBootExplorer:
 
 
     def _resolve_type_name(self, type_name, context_comp):
+        # Memoized per (type name, context FQN) while _build_call_graph runs; the result only depends on the
+        # components dict, which doesn't change during the build. Results are interned: they are stored in
+        # extends/implements and used as component lookup keys, so equal FQNs share one object.
+        cache = self._resolve_cache
+        if cache is None or not isinstance(type_name, str): return sys.intern(self._resolve_type_name_uncached(type_name, context_comp))
+        key = (type_name, context_comp.fully_qualified_name); resolved = cache.get(key)
+        if resolved is None: resolved = cache[key] = sys.intern(self._resolve_type_name_uncached(type_name, context_comp))
+        return resolved
+
+    def _resolve_type_name_uncached(self, type_name, context_comp):
         # Resolves a simple type name (like 'String', 'MyInnerClass', 'List') to a fully qualified name
         # based on imports, package context, and outer classes.
         if not isinstance(type_name, str): return str(type_name) # Handle non-string input
@@ -517,10 +626,8 @@ class SpringBootExplorer:
                  current_scope_comp = None # Reached top-level
 
         # 3. Direct Import Match (e.g., import com.example.MyClass;)
-        # SAFE: Iterate over imports safely
-        for imp in context_comp.imports or []:
-            if imp and imp.endswith(f".{base_name}"):
-                return imp + generic_part
+        imp = context_comp.imports_by_simple_name.get(base_name)
+        if imp: return imp + generic_part
 
         # 4. Same Package Match (e.g., class MyClass calling OtherClass in same package)
         if context_comp.package:
@@ -529,26 +636,22 @@ class SpringBootExplorer:
                 return potential_pkg_fqn + generic_part
 
         # 5. Wildcard Import Match (e.g., import java.util.*; calling List)
-        # SAFE: Iterate over imports safely
-        for imp in context_comp.imports or []:
-            if imp and imp.endswith(".*"):
-                package_prefix = imp[:-1] # Remove '*'
-                potential_wild_fqn = f"{package_prefix}{base_name}" # Note: package usually ends with '.'
-                if potential_wild_fqn in self.components:
-                    return potential_wild_fqn + generic_part
-                # Heuristic: Assume common wildcard imports resolve (can be inaccurate)
-                # Be cautious with this, might lead to incorrect graph edges
-                # if package_prefix in ["java.util.", "java.io.", "java.net.", "java.sql.", "javax.sql.", "java.time."]:
-                #      return potential_wild_fqn + generic_part
+        # Prefixes ("java.util.") are split from the imports once per component
+        for package_prefix in context_comp.wildcard_import_prefixes:
+            potential_wild_fqn = f"{package_prefix}{base_name}"
+            if potential_wild_fqn in self.components:
+                return potential_wild_fqn + generic_part
+            # Heuristic: Assume common wildcard imports resolve (can be inaccurate)
+            # Be cautious with this, might lead to incorrect graph edges
+            # if package_prefix in ["java.util.", "java.io.", "java.net.", "java.sql.", "javax.sql.", "java.time."]:
+            #      return potential_wild_fqn + generic_part
 
         # 6. java.lang Implicit Import (String, Object, Integer, etc.)
-        java_lang_types = {"String","Object","Integer","Boolean","Long","Double","Float","Character","Byte","Short","Void","Class","System","Math","Thread","Runnable","Exception","RuntimeException","Error","Throwable","Override","Deprecated","SuppressWarnings"}
-        if base_name in java_lang_types:
+        if base_name in self.JAVA_LANG_TYPES:
              return f"java.lang.{base_name}" + generic_part
 
         # 7. Common java.util types (often used without explicit wildcard import in sample code)
-        java_util_types = {"List","Map","Set","Collection","Optional", "ArrayList", "HashMap", "HashSet"}
-        if base_name in java_util_types:
+        if base_name in self.JAVA_UTIL_TYPES:
             return f"java.util.{base_name}" + generic_part
 
 
@@ -558,66 +661,52 @@ class SpringBootExplorer:
 
 
     def _build_call_graph(self):
-        logger.info("Building method call graph..."); self.call_graph = nx.DiGraph(); [self.call_graph.add_node(k) for k in self.methods]
+        logger.info("Building method call graph..."); self.call_graph = nx.DiGraph(); self.call_graph.add_nodes_from(self.methods)
+        self._method_keys_index = None # Rebuilt once from the current methods on first lookup
+        self._resolve_cache = {} # Type resolutions repeat across invocations; memoized only while the graph is built
         total_invocations, resolved_invocations = 0, 0
-        for method_key, method_obj in self.methods.items():
+        methods = self.methods; edges = {} # (caller, callee) -> None, added to the graph in one batch below
+        for method_key, method_obj in methods.items():
             # SAFE: Ensure method_invocations is iterable, default to empty list
             invocations = method_obj.method_invocations or []
             total_invocations += len(invocations)
 
-            for inv in invocations:
-                # SAFE: Skip if invocation object is None
-                if inv is None: continue
+            for qualifier, member_name, arg_count in invocations: # (qualifier or None, member, argument count or -1)
                 try:
-                    # Ensure inv is a MethodInvocation node before proceeding
-                    if isinstance(inv, MethodInvocation):
-                        target_method_keys = self._resolve_method_invocation(inv, method_obj.parent_component, method_obj)
-
-                        # SAFE: Ensure targets is iterable before checking/looping
-                        if target_method_keys:
-                             resolved_invocations += len(target_method_keys)
-                             for target_key in target_method_keys or []: # Add 'or []'
-                                 # Add edge if target exists in graph and edge doesn't already exist
-                                 if target_key in self.call_graph and not self.call_graph.has_edge(method_key, target_key):
-                                     self.call_graph.add_edge(method_key, target_key)
-                                     # Update Method.calls list (caller side)
-                                     target_method_obj = self.methods.get(target_key)
-                                     if target_method_obj: # Ensure target object exists
-                                          # SAFE: Initialize calls list if None
-                                          if method_obj.calls is None: method_obj.calls = []
-                                          if target_method_obj not in method_obj.calls:
-                                               method_obj.calls.append(target_method_obj)
-                                          # Update Method.called_by list (callee side)
-                                          if target_method_obj.called_by is None: target_method_obj.called_by = []
-                                          if method_obj not in target_method_obj.called_by:
-                                               target_method_obj.called_by.append(method_obj)
-                    else:
-                         # Log if item in list is not a MethodInvocation
-                         logger.debug(f"Skipping non-MethodInvocation item in {method_key}: {type(inv)}")
+                    target_method_keys = self._resolve_method_invocation(qualifier, member_name, arg_count, method_obj.parent_component, method_obj)
+
+                    # SAFE: Ensure targets is iterable before checking/looping
+                    if target_method_keys:
+                         resolved_invocations += len(target_method_keys)
+                         for target_key in target_method_keys or []: # Add 'or []'
+                             # Keep edges whose target is a known method; the dict drops repeats and keeps discovery order
+                             if target_key in methods: edges[(method_key, target_key)] = None
 
                 except Exception as e:
                     # Log errors during resolution for a specific invocation
-                    member_name = getattr(inv, 'member', '?') if hasattr(inv, 'member') else '?'
                     logger.debug(f"Error resolving invocation '{member_name}' in {method_key}: {e}", exc_info=False) # Limit traceback noise
 
+        self._resolve_cache = None # Free the memo; components may change before the next build
+        self.call_graph.add_edges_from(edges)
+        # Update Method.calls (caller side) and Method.called_by (callee side); edges are unique, so no membership scans
+        for method_key, target_key in edges:
+            method_obj = methods[method_key]; target_method_obj = methods[target_key]
+            # SAFE: Initialize lists if None
+            if method_obj.calls is None: method_obj.calls = []
+            if target_method_obj.called_by is None: target_method_obj.called_by = []
+            method_obj.calls.append(target_method_obj); target_method_obj.called_by.append(method_obj)
         edge_count = self.call_graph.number_of_edges()
         node_count = self.call_graph.number_of_nodes()
         logger.info(f"Call graph built: {node_count} nodes, {edge_count} edges. Processed ~{total_invocations} potential invocations, resolved ~{resolved_invocations} calls.")
 
 
-    def _resolve_method_invocation(self, inv, context_comp, context_method):
-        # Resolves a MethodInvocation node to a list of potential target method keys (FQNs with signatures)
-        if not isinstance(inv, MethodInvocation):
-             logger.warning(f"Attempted to resolve non-MethodInvocation: {type(inv)}")
-             return []
-
-        method_name = inv.member # Name of the method being called
-        qualifier_node = inv.qualifier # Node representing the object/class the method is called on (e.g., variable, 'this', 'super', ClassName)
+    def _resolve_method_invocation(self, qualifier_str, method_name, arg_count, context_comp, context_method):
+        # Resolves one recorded call site to a list of potential target method keys (FQNs with signatures).
+        # qualifier_str is what the method is called on (variable, 'this', 'super', ClassName), or None when unqualified;
+        # arg_count is -1 when unknown.
         target_fqn = None # Fully qualified name of the class containing the target method
 
-        if qualifier_node:
-            qualifier_str = str(qualifier_node) # String representation for simple checks/lookups
-
+        if qualifier_str:
             if qualifier_str == 'this': target_fqn = context_comp.fully_qualified_name
             elif qualifier_str == 'super':
                  # Determine superclass FQN
@@ -633,24 +722,13 @@ class SpringBootExplorer:
             else: # Qualifier is a variable, field, parameter, or class name
                 resolved_qualifier_type_fqn = None
 
-                # 1. Check Fields
-                # SAFE: Use safe dict access
-                field_obj = (context_comp.fields or {}).get(qualifier_str)
-                if field_obj:
-                    # Field type might be simple, needs resolving
-                    resolved_qualifier_type_fqn = self._resolve_type_name(field_obj.field_type.split('<')[0], context_comp)
-
-                # 2. Check Method Parameters (if field not found)
-                if not resolved_qualifier_type_fqn and context_method and hasattr(context_method, 'parameters'):
-                    # SAFE: Use 'or []'
-                    for p_sig in context_method.parameters or []:
-                         if not p_sig: continue
-                         parts = p_sig.split()
-                         # Check if parameter name matches qualifier
-                         if len(parts) > 1 and parts[-1] == qualifier_str:
-                             param_type_name = parts[0].split('<')[0] # Base type of parameter
-                             resolved_qualifier_type_fqn = self._resolve_type_name(param_type_name, context_comp)
-                             break # Found matching parameter
+                # 1./2. Check Fields, then Method Parameters: one probe of the method's {name: base type} map
+                if context_method is not None and context_method.parent_component is context_comp: local_types = context_method.local_base_types
+                else: local_types = {name: f.base_type for name, f in (context_comp.fields or {}).items()} # Fields only
+                base_type = local_types.get(qualifier_str)
+                if base_type is not None:
+                    # Type might be simple, needs resolving
+                    resolved_qualifier_type_fqn = self._resolve_type_name(base_type, context_comp)
 
                 # 3. Local Variable Resolution (Skipped - too complex for static analysis)
                 # We assume if it's not a field or parameter, it might be a static call on a class
@@ -671,31 +749,39 @@ class SpringBootExplorer:
 
         # If we determined a target class FQN, find the method in its hierarchy
         if target_fqn:
-            return self._find_method_in_hierarchy(target_fqn, method_name, inv)
+            return self._find_method_in_hierarchy(target_fqn, method_name, arg_count)
         else:
              # Log if we couldn't figure out the target class
              logger.debug(f"Could not determine target class FQN for invocation '{method_name}' in {context_method}")
              return []
 
 
-    def _find_method_in_hierarchy(self, start_fqn, method_name, invocation_node):
-        # Finds potential method keys matching name and arg count up the hierarchy
+    def _method_keys_by_owner(self):
+        # {(owner FQN, method name): [method keys]} in registration order. A key "pkg.Cls.name(T1,T2)" splits at the
+        # last '.' before its '(' (parameter types may contain dots). Rebuilt when the methods dict changes size.
+        cached = self.__dict__.get('_method_keys_index')
+        if cached is None or cached[0] != len(self.methods):
+            index = defaultdict(list)
+            for key in self.methods:
+                owner, _, name = key.partition('(')[0].rpartition('.')
+                index[(owner, name)].append(key)
+            cached = self._method_keys_index = (len(self.methods), index)
+        return cached[1]
+
+    def _find_method_in_hierarchy(self, start_fqn, method_name, arg_count):
+        # Finds potential method keys matching name and arg count (-1: any) up the hierarchy
         matches = set()
-        queue = [start_fqn] # Start BFS from the initial target FQN
-        visited = set()
-
-        # SAFE: Default arg_c to -1 if arguments is None or not present
-        arg_count = len(invocation_node.arguments) if invocation_node and hasattr(invocation_node,'arguments') and invocation_node.arguments is not None else -1
+        queue = deque([start_fqn]) # Start BFS from the initial target FQN; popleft() is O(1), list.pop(0) shifts every entry
+        visited = set(); method_keys_by_owner = self._method_keys_by_owner()
 
         while queue:
-            current_fqn = queue.pop(0)
+            current_fqn = queue.popleft()
             if not current_fqn or current_fqn in visited: continue # Skip if None, empty, or already visited
             visited.add(current_fqn)
 
             # --- Check Methods in current_fqn ---
-            # Optimization: Iterate only potentially matching keys
-            prefix = f"{current_fqn}.{method_name}("
-            possible_keys = [k for k in self.methods if k.startswith(prefix)]
+            # Keys registered under (current_fqn, method_name): one dict probe instead of a prefix scan over all methods
+            possible_keys = method_keys_by_owner.get((current_fqn, method_name), ())
 
             for method_key in possible_keys:
                  method_obj = self.methods[method_key]
@@ -755,52 +841,148 @@ class SpringBootExplorer:
 
 
     def _build_string_index(self):
-        logger.info("Building string and identifier index..."); self.string_index = defaultdict(list)
-        # Regex for Java identifiers (allows Unicode chars common in some languages)
-        identifier_regex = re.compile(r'\b[a-zA-Z_\u00C0-\u00FF][a-zA-Z0-9_\u00C0-\u00FF]*\b')
-        # Regex for standard Java string literals (handles basic escapes)
-        string_literal_regex = re.compile(r'"((?:\\.|[^"\\])*)"')
+        logger.info("Building string and identifier index..."); self.string_index = index = defaultdict(list)
         # Simple regex for potential properties/YAML keys (may need refinement)
         # property_key_regex = re.compile(r'^\s*([a-zA-Z0-9.-]+)\s*[:=]')
 
+        # Each source file is scanned once (nested/inner classes share their file). Text decoded by an in-process
+        # parse is reused; only files parsed in worker processes or reused from the parse cache are read here.
+        paths = list(dict.fromkeys(comp.file_path for comp in self.components.values()))
+        texts = self._source_texts; self._source_texts = {} # Drop the texts once indexed
+        scans = {path: _scan_index_content(texts[path]) for path in paths if path in texts}
+        to_read = [path for path in paths if path not in scans]
+        if len(to_read) > 200 and (os.cpu_count() or 1) > 1: scans.update(self._scan_index_files_processes(to_read))
+        elif to_read: scans.update(self._scan_index_files_threads(to_read))
+
+        # Identifiers repeat across files and across the classes of one file: each spelling is lowercased once, and every
+        # posting for it shares the first-seen key and text objects instead of holding a copy per file
+        spellings = {} # identifier -> (lowercase key, identifier)
         for fqn, comp in self.components.items():
-            content = ""; file_path = comp.file_path
-            try: # Read file content (similar logic as in _parse_java_file)
-                read_ok = False
-                for enc in ['utf-8', 'latin-1', 'cp1252']:
-                    try:
-                         with open(file_path,'r',encoding=enc) as f: content=f.read(); read_ok=True; break
-                    except UnicodeDecodeError: continue
-                    except Exception: break # Stop on other read errors
-                if not read_ok: logger.warning(f"Index build: Could not read {file_path}"); continue
-            except Exception as e: logger.warning(f"Index build: Failed reading {file_path}: {e}"); continue
-
-            try: # Process content for indexing
-                # Index identifiers
-                words = set(identifier_regex.findall(content))
-                # Filter out very short words, pure numbers, and maybe keywords later
-                for w in words:
-                     if len(w)>2 and not w.isdigit():
-                          self.string_index[w.lower()].append({'fqn':fqn,'path':file_path,'original':w, 'type':'identifier'})
-
-                # Index string literals
-                literals = string_literal_regex.findall(content)
-                for lit in literals:
-                     if len(lit)>1: # Ignore empty strings ""
-                          self.string_index[lit.lower()].append({'fqn':fqn,'path':file_path,'original':lit, 'type':'literal'})
-
-                # Consider adding indexing for comments or properties if needed
-                # for line in content.splitlines():
-                #      prop_match = property_key_regex.match(line)
-                #      if prop_match:
-                #           key = prop_match.group(1)
-                #           if len(key)>2:
-                #                self.string_index[key.lower()].append({'fqn': fqn, 'path': file_path, 'original': key, 'type': 'property'})
-
-
-            except Exception as e: logger.error(f"Error during regex indexing for {file_path}: {e}")
+            file_path = comp.file_path; terms, read_err, scan_err = scans[file_path]
+            if scan_err is not None: logger.error(f"Error during regex indexing for {file_path}: {scan_err}"); continue
+            if terms is None: logger.warning(f"Index build: Could not read {file_path}" + (f": {read_err}" if read_err else "")); continue
+            words, literals = terms
+            # Index identifiers
+            for w in words:
+                 spelled = spellings.get(w)
+                 if spelled is None: spelled = spellings[w] = (w.lower(), w)
+                 index[spelled[0]].append((fqn, file_path, spelled[1], 'identifier'))
+            # Index string literals
+            for lit in literals:
+                 index[lit.lower()].append((fqn, file_path, lit, 'literal'))
+
+            # Consider adding indexing for comments or properties if needed
+            # for line in content.splitlines():
+            #      prop_match = property_key_regex.match(line)
+            #      if prop_match:
+            #           key = prop_match.group(1)
+            #           if len(key)>2:
+            #                self.string_index[key.lower()].append({'fqn': fqn, 'path': file_path, 'original': key, 'type': 'property'})
         logger.info(f"String/Identifier index built with {len(self.string_index)} unique terms.")
 
+    def _scan_index_files_threads(self, paths):
+        # File reads release the GIL, so read_all overlaps the I/O; the regex scans then run here one file at a time
+        contents = read_all(paths)
+        return {path: _scan_index_content(*contents[path]) for path in paths}
+
+    def _scan_index_files_processes(self, paths):
+        # The regex scans are CPU-bound, so large projects spread them over processes like _parse_java_files_processes
+        from concurrent.futures import ProcessPoolExecutor
+        max_workers = min(len(paths), os.cpu_count() or 1)
+        chunksize = max(1, len(paths) // (4 * max_workers))
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=self._process_pool_context()) as executor:
+                return dict(zip(paths, executor.map(_scan_index_file, paths, chunksize=chunksize)))
+        except Exception as e: # e.g. BrokenProcessPool, or process creation not permitted in this environment
+            logger.warning(f"Process pool indexing failed ({type(e).__name__}: {e}). Indexing in this process.")
+            return self._scan_index_files_threads(paths)
+
+
+    # --- Parse Cache (per file) ---
+    # The whole-analysis cache (explorer_cache.pkl) is all-or-nothing: any edit invalidates it. This second cache keeps
+    # each Java file's parse results keyed by a BLAKE2b content digest, so after an edit only changed files are parsed
+    # again; relationships, call graph and string index are still rebuilt over everything. (mtime_ns, size) is stored
+    # alongside the digest so untouched files are matched with a stat call, without reading them. Each entry also keeps
+    # the file's previous version, so switching to another branch and back re-parses nothing the first switch parsed.
+
+    def _parse_cache_file(self): return os.path.join(self.cache_dir, "parse_cache.pkl")
+
+    @staticmethod
+    def _file_digest(path):
+        with open(path, 'rb') as f: return hashlib.blake2b(f.read(), digest_size=16).digest()
+
+    def _load_parse_cache(self):
+        # {path: ((mtime_ns, size), digest, pickled bundle, (previous digest, previous bundle) or None)};
+        # anything unreadable or from another version counts as empty
+        try:
+            with open(self._parse_cache_file(), 'rb') as f: data = pickle.load(f)
+            if data.get('version') == self.CACHE_VERSION and data.get('project_path') == self.project_path: return data['files']
+        except FileNotFoundError: pass
+        except Exception as e: logger.warning(f"Ignoring unreadable parse cache: {type(e).__name__} - {e}")
+        return {}
+
+    def _split_by_parse_cache(self, files, parse_cache):
+        # Returns (file infos to parse, {path: up-to-date cache entry}, {stale path: ((mtime_ns, size), digest, previous)})
+        stale, fresh, new_stamps = [], {}, {}
+        for f_info in files:
+            path = f_info["path"]; entry = parse_cache.get(path)
+            try: st = os.stat(path)
+            except OSError: stale.append(f_info); continue # Let the parser record the error
+            stamp = (st.st_mtime_ns, st.st_size)
+            if entry is not None and entry[0] == stamp: fresh[path] = entry; continue
+            try: digest = self._file_digest(path)
+            except OSError: stale.append(f_info); continue
+            if entry is None: stale.append(f_info); new_stamps[path] = (stamp, digest, None); continue
+            if entry[1] == digest: fresh[path] = (stamp, digest, entry[2], entry[3]) # Touched, not changed
+            elif entry[3] is not None and entry[3][0] == digest: fresh[path] = (stamp, digest, entry[3][1], entry[1:3]) # Back to the previous version
+            else: stale.append(f_info); new_stamps[path] = (stamp, digest, entry[1:3])
+        return stale, fresh, new_stamps
+
+    def _merge_cached_parse(self, bundle, index):
+        cached_index, components, methods, parse_errors = pickle.loads(bundle)
+        for comp in components:
+            # Indices are positional in the file tree and shift when files are added/removed; rebase onto the current one
+            comp.index = index + comp.index[len(cached_index):]
+            self.components[comp.fully_qualified_name] = comp; self._add_to_package_structure(comp.fully_qualified_name)
+        self.methods.update(methods); self.parse_errors.extend(parse_errors)
+
+    def _restore_file_order(self, files):
+        # Orders components, methods, errors and package listings as a from-scratch parse of `files` would
+        position = {f["path"]: i for i, f in enumerate(files)}; last = len(position)
+        self.components = dict(sorted(self.components.items(), key=lambda kv: position.get(kv[1].file_path, last)))
+        self.methods = dict(sorted(self.methods.items(), key=lambda kv: position.get(kv[1].parent_component.file_path, last)))
+        self.parse_errors.sort(key=lambda err: position.get(err[0], last))
+        self.package_structure = defaultdict(list); self._packaged_fqns = set() # Refilled in component order, like _process_type_declaration does
+        for fqn in self.components: self._add_to_package_structure(fqn)
+
+    def _save_parse_cache(self, files, stale, fresh_entries, new_stamps, parse_cache):
+        # Called right after parsing, before relationships/call graph link objects across files, so each file's
+        # components and methods pickle on their own
+        if not stale and len(fresh_entries) == len(parse_cache) and all(parse_cache.get(p) is e for p, e in fresh_entries.items()): return # Nothing changed
+        by_file = {path: ([], {}, []) for path in new_stamps}
+        for comp in self.components.values():
+            if comp.file_path in by_file: by_file[comp.file_path][0].append(comp)
+        for key, m in self.methods.items():
+            bucket = by_file.get(m.parent_component.file_path)
+            if bucket is not None: bucket[1][key] = m
+        for err in self.parse_errors:
+            if err[0] in by_file: by_file[err[0]][2].append(err)
+
+        entries = dict(fresh_entries)
+        for f_info in stale:
+            path = f_info["path"]
+            if path not in new_stamps: continue # Could not be fingerprinted
+            comps, meths, errs = by_file[path]
+            stamp, digest, previous = new_stamps[path]
+            try: entries[path] = (stamp, digest, pickle.dumps((f_info["index"], comps, meths, errs), pickle.HIGHEST_PROTOCOL), previous)
+            except Exception as e: logger.debug(f"Not caching parse results for {f_info['path']}: {e}")
+        try:
+            if not os.path.isdir(self.cache_dir): os.makedirs(self.cache_dir)
+            with open(self._parse_cache_file(), 'wb') as f:
+                pickle.dump({'version': self.CACHE_VERSION, 'project_path': self.project_path, 'files': entries}, f, pickle.HIGHEST_PROTOCOL)
+        except Exception as e: logger.warning(f"Failed to save parse cache: {e}")
+    # --- End Parse Cache ---
+
 
     # --- Caching Logic ---
 
@@ -810,6 +992,67 @@ class SpringBootExplorer:
         except OSError: # Handle file not found during key generation
             return f"{path}:error_or_missing"
 
+    def _iter_source_file_mtimes(self):
+        # Yields (path, mtime_ns) for every cache-relevant file. Same files as an os.walk that prunes ignored and
+        # hidden directories and doesn't follow directory symlinks, but entries come straight from scandir.
+        ignored = self.IGNORED_DIRS; extensions = self.CACHE_RELEVANT_EXTENSIONS; stack = [self.project_path]
+        while stack:
+            try: it = os.scandir(stack.pop())
+            except OSError: continue # Unreadable directory, like os.walk's default onerror
+            with it:
+                for entry in it:
+                    try: is_dir = entry.is_dir()
+                    except OSError: is_dir = False
+                    if is_dir:
+                        if entry.name not in ignored and not entry.name.startswith('.') and not entry.is_symlink(): stack.append(entry.path)
+                    elif entry.name.endswith(extensions):
+                        try: yield entry.path, entry.stat().st_mtime_ns
+                        except OSError: pass # Ignore errors for files that might disappear during walk
+
+    def _source_file_mtimes(self):
+        # {path: mtime_ns} for every cache-relevant file; comparing whole maps also catches added, deleted and renamed files
+        return dict(self._iter_source_file_mtimes())
+
+    def _source_files_unchanged(self, cached_mtimes):
+        # Same answer as `self._source_file_mtimes() == cached_mtimes`, but stops at the first added or modified file;
+        # deleted files show up as a count mismatch at the end
+        if not isinstance(cached_mtimes, dict): return False
+        seen = 0
+        for path, mtime in self._iter_source_file_mtimes():
+            if cached_mtimes.get(path) != mtime: return False
+            seen += 1
+        return seen == len(cached_mtimes)
+
+    def _call_graph_to_csr(self):
+        # Compressed sparse rows: the successors of nodes[i] are nodes[j] for j in indices[indptr[i]:indptr[i+1]].
+        # The two int arrays pickle as raw bytes, instead of one tuple of key strings per edge.
+        graph = self.call_graph; nodes = list(graph) if graph else []; node_idx = {n: i for i, n in enumerate(nodes)}
+        indptr = array('i', [0]); indices = array('i')
+        for n in nodes: indices.extend([node_idx[v] for v in graph.successors(n)]); indptr.append(len(indices))
+        return nodes, indptr, indices
+
+    @staticmethod
+    def _call_graph_edges_from_csr(nodes, indptr, indices):
+        # Yields (caller, callee) key pairs in the same order call_graph.edges() produced them at save time
+        for i, u in enumerate(nodes):
+            for j in indices[indptr[i]:indptr[i + 1]]: yield u, nodes[j]
+
+    # Attributes written to the analysis cache, one column each; everything else is rebuilt on load
+    CACHED_COMPONENT_ATTRS = ('name', 'file_path', 'component_type', 'index', 'imports', 'annotations', 'package', 'fully_qualified_name', 'extends', 'implements', 'generics')
+    CACHED_METHOD_ATTRS = ('name', 'signature', 'annotations', 'modifiers', 'return_type', 'parameters', 'exceptions', 'start_line', 'end_line')
+
+    @staticmethod
+    def _to_columns(objects, attrs):
+        # {'keys': [dict keys], attr: [value per object], ...}: attribute names are stored once, not once per object
+        values = list(objects.values()); columns = {'keys': list(objects)}
+        for attr in attrs: columns[attr] = [getattr(v, attr) for v in values]
+        return columns
+
+    @staticmethod
+    def _from_columns(columns, attrs):
+        # Yields (key, value of each attr...) rows back out of a _to_columns table
+        return zip(columns['keys'], *(columns[attr] for attr in attrs))
+
     def _save_to_cache(self):
         if not os.path.isdir(self.project_path): logger.error("Project path is invalid, cannot save cache."); return
         cache_file = os.path.join(self.cache_dir, "explorer_cache.pkl"); logger.info(f"Saving analysis cache to: {cache_file}")
@@ -819,144 +1062,134 @@ class SpringBootExplorer:
             try: os.makedirs(self.cache_dir)
             except Exception as e: logger.error(f"Cannot create cache directory '{self.cache_dir}': {e}"); return
 
-        # Prepare data for pickling (convert objects to dicts)
-        components_serializable = {}
-        for k, v in self.components.items():
-            try: components_serializable[k] = v.to_dict()
-            except Exception as e: logger.error(f"Error serializing component {k} for cache: {e}")
-
-        methods_serializable = {}
-        for k, v in self.methods.items():
-             try: methods_serializable[k] = v.to_dict()
-             except Exception as e: logger.error(f"Error serializing method {k} for cache: {e}")
-
-        cache_data = {
+        # Prepare data for pickling: one column (list) per attribute instead of one dict per object
+        try: components_columns = self._to_columns(self.components, self.CACHED_COMPONENT_ATTRS)
+        except Exception as e: logger.error(f"Error serializing components for cache: {e}"); return
+        try:
+            methods_columns = self._to_columns(self.methods, self.CACHED_METHOD_ATTRS)
+            methods_columns['parent_fqn'] = [m.parent_component.fully_qualified_name for m in self.methods.values()] # Owning component's key, so loading never has to parse it out of the method key
+        except Exception as e: logger.error(f"Error serializing methods for cache: {e}"); return
+
+        try: file_mtimes = self._source_file_mtimes()
+        except Exception as e: logger.error(f"Cannot fingerprint project files for cache: {e}"); return
+
+        # The file is a sequence of pickles: this small header first, then one (name, data) record per section.
+        # Loading unpickles the header alone to validate the cache, and only reads the sections if it is still valid.
+        header = {
+            'version': self.CACHE_VERSION,
+            'file_mtimes': file_mtimes,
             'project_path': self.project_path,
             'timestamp': time.time(),
-            'components': components_serializable,
-            'methods': methods_serializable,
+            'sections': ('components', 'methods', 'call_graph_csr', 'index_structure', 'package_structure', 'string_index', 'parse_errors')
+        }
+        sections = {
+            'components': components_columns,
+            'methods': methods_columns,
+            'call_graph_csr': self._call_graph_to_csr(),
             'index_structure': self.index_structure,
             'package_structure': dict(self.package_structure), # Convert defaultdict
-            'string_index': {k: list(v) for k, v in self.string_index.items()}, # Convert defaultdict values
-            'call_graph_edges': list(self.call_graph.edges()) if self.call_graph else [],
+            'string_index': dict(self.string_index), # Convert defaultdict; entries are plain tuples
             'parse_errors': self.parse_errors
         }
+        tmp_file = cache_file + ".tmp"
         try:
-            with open(cache_file, 'wb') as f: pickle.dump(cache_data, f, pickle.HIGHEST_PROTOCOL)
+            # One Pickler for all records, so a string shared between sections is still written once (the memo spans dump calls).
+            # Written to a temporary file and renamed, so an interrupted save never leaves a truncated cache behind.
+            with open(tmp_file, 'wb') as f:
+                pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL); pickler.dump(header)
+                for name in header['sections']: pickler.dump((name, sections[name]))
+            os.replace(tmp_file, cache_file)
             logger.info("Analysis cache saved successfully.")
-        except Exception as e: logger.error(f"Failed to save cache file '{cache_file}': {e}")
+        except Exception as e:
+            logger.error(f"Failed to save cache file '{cache_file}': {e}")
+            try: os.remove(tmp_file)
+            except OSError: pass
+
+
+    def _cache_header_valid(self, data):
+        # --- Basic Cache Validation ---
+        if not isinstance(data, dict) or data.get('version') != self.CACHE_VERSION:
+            logger.info("Cache was written by a different explorer version. Ignoring cache."); return False
+        if data.get('project_path') != self.project_path:
+            logger.warning("Cache belongs to a different project path. Ignoring cache."); return False
 
+        cache_timestamp = data.get('timestamp', 0)
+        if cache_timestamp == 0:
+             logger.warning("Cache timestamp missing or invalid. Ignoring cache."); return False
+
+        # --- File Fingerprint Validation (modified, added or removed source files) ---
+        logger.debug("Validating cache against project file modification times...")
+        try: files_unchanged = self._source_files_unchanged(data.get('file_mtimes'))
+        except Exception as e: logger.warning(f"Error during cache validation walk: {e}. Assuming cache is invalid."); return False
+
+        if not files_unchanged:
+            logger.info(f"Project files changed since cache was created ({time.ctime(cache_timestamp)}). Invalidating cache."); return False
+        return True
 
     def _load_from_cache(self):
         cache_file = os.path.join(self.cache_dir, "explorer_cache.pkl")
         if not os.path.isfile(cache_file): logger.info("Cache file not found."); return False
         logger.info(f"Attempting to load analysis cache from: {cache_file}")
         try:
-            with open(cache_file, 'rb') as f: data = pickle.load(f)
-
-            # --- Basic Cache Validation ---
-            if data.get('project_path') != self.project_path:
-                logger.warning("Cache belongs to a different project path. Ignoring cache."); return False
-
-            cache_timestamp = data.get('timestamp', 0)
-            if cache_timestamp == 0:
-                 logger.warning("Cache timestamp missing or invalid. Ignoring cache."); return False
-
-            # --- Timestamp Validation (Check for newer source files) ---
-            logger.debug("Validating cache timestamp against project files...")
-            latest_modification_time = 0
-            relevant_extensions = ('.java', '.properties', '.yml', '.yaml', '.xml')
-            try:
-                for root, dirs, files in os.walk(self.project_path):
-                    # Efficiently filter ignored directories
-                    dirs[:] = [d for d in dirs if d not in self.IGNORED_DIRS and not d.startswith('.')]
-                    for filename in files:
-                        if filename.endswith(relevant_extensions):
-                            try:
-                                file_path = os.path.join(root, filename)
-                                latest_modification_time = max(latest_modification_time, os.path.getmtime(file_path))
-                            except OSError: pass # Ignore errors for files that might disappear during walk
-            except Exception as e: logger.warning(f"Error during cache timestamp validation walk: {e}. Assuming cache is invalid."); return False
-
-            if latest_modification_time > cache_timestamp:
-                logger.info(f"Project files modified ({time.ctime(latest_modification_time)}) since cache was created ({time.ctime(cache_timestamp)}). Invalidating cache."); return False
+            with open(cache_file, 'rb') as f:
+                # The header is validated before any section is unpickled, so a stale cache costs only the header read
+                unpickler = pickle.Unpickler(f); data = unpickler.load()
+                if not self._cache_header_valid(data): return False
+                for _ in data['sections']: name, section = unpickler.load(); data[name] = section
 
             # --- Data Reconstruction ---
             logger.info("Cache is valid. Loading data...");
             # Load basic structures
             self.index_structure = data.get('index_structure', {})
             self.package_structure = defaultdict(list, data.get('package_structure', {}))
-            # Rebuild string_index as defaultdict
-            self.string_index = defaultdict(list)
-            cached_string_idx = data.get('string_index', {})
-            for k, v_list in cached_string_idx.items(): self.string_index[k].extend(v_list)
+            self._packaged_fqns = {fqn for fqns in self.package_structure.values() for fqn in fqns}
+            # Rebuild string_index as defaultdict; the unpickled lists are fresh, so they are adopted as-is
+            self.string_index = defaultdict(list, data.get('string_index', {}))
 
             self.parse_errors = data.get('parse_errors', [])
             self.components = {} # Clear before loading
             self.methods = {}    # Clear before loading
 
-            # Reconstruct components from dicts
-            cached_components = data.get('components', {})
-            if not cached_components: logger.warning("Cache contains no component data.");
-            for fqn, comp_dict in cached_components.items():
+            # Reconstruct components from their columns (see CACHED_COMPONENT_ATTRS)
+            cached_components = data['components']
+            if not cached_components['keys']: logger.warning("Cache contains no component data.");
+            for fqn, name, file_path, comp_type, index, imports, annotations, package, comp_fqn, extends, implements, generics in self._from_columns(cached_components, self.CACHED_COMPONENT_ATTRS):
                  try:
-                      c=SpringBootComponent(comp_dict['name'],comp_dict['file_path'],comp_dict['component_type'],comp_dict['index'])
-                      # Assign attributes safely using .get()
-                      c.imports = comp_dict.get('imports', [])
-                      c.annotations = comp_dict.get('annotations', [])
-                      c.package = comp_dict.get('package', '')
-                      c.fully_qualified_name = comp_dict.get('fully_qualified_name', fqn)
-                      c.extends = comp_dict.get('extends') # Can be None, str, or list
-                      c.implements = comp_dict.get('implements', [])
-                      c.generics = comp_dict.get('generics', [])
+                      c=SpringBootComponent(name,file_path,comp_type,index)
+                      c.imports = imports or []
+                      c.annotations = annotations or []
+                      c.package = package or ''
+                      c.fully_qualified_name = comp_fqn or fqn
+                      c.extends = extends # Can be None, str, or list
+                      c.implements = implements or []
+                      c.generics = generics or []
                       # Fields and Methods dicts on component will be populated when Methods are loaded below
                       c.fields = {} # Initialize empty dicts
                       c.methods = {}
                       self.components[fqn] = c
-                 except KeyError as e_key: logger.error(f"Missing key {e_key} loading component {fqn} from cache.")
                  except Exception as e_comp: logger.error(f"Error reconstructing component {fqn} from cache: {e_comp}")
 
-            # Reconstruct methods from dicts and link to components
-            cached_methods = data.get('methods', {})
-            if not cached_methods: logger.warning("Cache contains no method data.");
-            for method_key, method_dict in cached_methods.items():
+            # Reconstruct methods from their columns (see CACHED_METHOD_ATTRS) and link to components
+            cached_methods = data['methods']
+            if not cached_methods['keys']: logger.warning("Cache contains no method data.");
+            for method_key, method_name, signature, annotations, modifiers, return_type, parameters, exceptions, start_line, end_line, parent_fqn in self._from_columns(cached_methods, self.CACHED_METHOD_ATTRS + ('parent_fqn',)):
                 try:
-                    # Determine parent FQN (needs careful parsing based on key structure)
-                    fqn_parts = method_key.split('.')
-                    # method_name_with_sig = fqn_parts[-1] # Not reliable if class name has '.'
-                    method_name = method_dict.get('name')
-
-                    # Heuristic: Assume key is package.Class$Inner.method(params) or package.Class.method(params)
-                    # Find the last part that starts with lowercase (likely method name start) or known delimiters like '('
-                    split_point = -1
-                    for i in range(len(fqn_parts) - 1, 0, -1):
-                         part = fqn_parts[i]
-                         # Check for method signature start or common method naming patterns
-                         if '(' in part or (part and part[0].islower() and i > 0 and fqn_parts[i-1][0].isupper()):
-                              split_point = i
-                              break
-                    if split_point != -1:
-                         parent_fqn = '.'.join(fqn_parts[:split_point])
-                    else: # Fallback if heuristic fails (e.g., all caps class names)
-                         parent_fqn = '.'.join(fqn_parts[:-1]) # Assume last part is method name + sig
-
-
-                    parent_comp = self.components.get(parent_fqn)
+                    parent_comp = self.components.get(parent_fqn) # Stored at save time (see _save_to_cache)
                     if parent_comp:
-                        m=Method(method_name, method_dict['signature'], "", parent_comp) # No body needed
-                        m.annotations = method_dict.get('annotations', [])
-                        m.modifiers = method_dict.get('modifiers', [])
-                        m.return_type = method_dict.get('return_type')
-                        m.parameters = method_dict.get('parameters', [])
-                        m.exceptions = method_dict.get('exceptions', [])
-                        m.start_line = method_dict.get('start_line', 0)
-                        m.end_line = method_dict.get('end_line', 0)
+                        m=Method(method_name, signature, "", parent_comp) # No body needed
+                        m.annotations = annotations or []
+                        m.modifiers = modifiers or []
+                        m.return_type = return_type
+                        m.parameters = parameters or []
+                        m.exceptions = exceptions or []
+                        m.start_line = start_line or 0
+                        m.end_line = end_line or 0
                         m.calls = [] # Will be rebuilt from graph
                         m.called_by = [] # Will be rebuilt from graph
 
-                        self.methods[method_key] = m
+                        m.canonical_key = method_key; self.methods[method_key] = m
                         # Link method back to parent component's method dict
-                        comp_method_key_sig = method_dict['signature']
+                        comp_method_key_sig = signature
                         if method_name == '<init>': # Use ClassName for constructor key in component
                              comp_method_key = f"{parent_comp.name}{comp_method_key_sig}"
                         else:
@@ -968,14 +1201,13 @@ class SpringBootExplorer:
                     else:
                         logger.warning(f"Parent component '{parent_fqn}' not found for method '{method_key}' during cache load.")
 
-                except KeyError as e_key: logger.error(f"Missing key {e_key} loading method {method_key} from cache.")
                 except Exception as e_meth: logger.error(f"Error reconstructing method {method_key} from cache: {e_meth}")
 
             # Reconstruct call graph
             self.call_graph = nx.DiGraph()
             # Add nodes *only* for methods successfully loaded
-            [self.call_graph.add_node(k) for k in self.methods]
-            edges = data.get('call_graph_edges', [])
+            self.call_graph.add_nodes_from(self.methods)
+            edges = self._call_graph_edges_from_csr(*data.get('call_graph_csr', ([], array('i', [0]), array('i'))))
             # Add edges only between nodes that exist in the graph
             valid_edges = [(u, v) for u, v in edges if u in self.call_graph and v in self.call_graph]
             self.call_graph.add_edges_from(valid_edges)
@@ -986,18 +1218,15 @@ class SpringBootExplorer:
                  if u in self.methods and v in self.methods:
                      caller_method = self.methods[u]
                      callee_method = self.methods[v]
-                     # Append if not already present (safety check)
-                     if callee_method not in (caller_method.calls or []):
-                         if caller_method.calls is None: caller_method.calls = []
-                         caller_method.calls.append(callee_method)
-                     if caller_method not in (callee_method.called_by or []):
-                         if callee_method.called_by is None: callee_method.called_by = []
-                         callee_method.called_by.append(caller_method)
+                     # Graph edges are unique, so each pair is appended once without a membership scan
+                     if caller_method.calls is None: caller_method.calls = []
+                     if callee_method.called_by is None: callee_method.called_by = []
+                     caller_method.calls.append(callee_method); callee_method.called_by.append(caller_method)
 
             logger.info(f"Cache loaded successfully. Graph: {self.call_graph.number_of_nodes()} nodes, {self.call_graph.number_of_edges()} edges.")
             return True
 
-        except (EOFError, pickle.UnpicklingError, KeyError, AttributeError, TypeError) as e:
+        except (EOFError, pickle.UnpicklingError, KeyError, IndexError, AttributeError, TypeError) as e:
              logger.error(f"Cache file '{cache_file}' is invalid or corrupt: {e}. Removing cache file.")
              try: os.remove(cache_file)
              except OSError: pass # Ignore error if removal fails
@@ -1015,21 +1244,41 @@ class SpringBootExplorer:
     def search_method(self, name_part):
         """Searches for methods whose names contain the given string (case-insensitive)."""
         name_lower = name_part.lower()
-        # Use list comprehension for potentially better performance on large method sets
-        matches = [m for k, m in self.methods.items() if name_lower in m.name.lower()]
+        # Substring test runs once per distinct lowercase name (index built after analysis), not once per method/overload
+        matches = [m for n, bucket in self.methods_by_name_lower.items() if name_lower in n for m in bucket]
         # Sort results for consistent display
         return sorted(matches, key=lambda m: (m.parent_component.fully_qualified_name, m.name))
 
+    def get_component_types(self):
+        """Returns the sorted list of distinct component types found (excluding 'Unknown')."""
+        return self._component_types_sorted
+
+    def search_component(self, name_part):
+        """Returns components whose FQN contains the given string (case-insensitive)."""
+        name_lower = name_part.lower()
+        return [c for fqn_lower, c in self._fqn_lower_index if name_lower in fqn_lower]
+
     def search_string(self, term):
-        """Searches the pre-built index for identifiers or string literals (case-insensitive)."""
-        # defaultdict handles missing keys automatically, returning []
-        return self.string_index.get(term.lower(), [])
+        """Searches the pre-built index for identifiers or string literals (case-insensitive). Comma-separated terms are OR-ed."""
+        # .get() on the defaultdict returns [] without inserting the missing key
+        key = term.lower()
+        if key in self.string_index or ',' not in key: entries = self.string_index.get(key, ())
+        else:
+            # Multi-term query: one dict lookup per term (the index is already the matcher), de-duplicated across terms
+            entries = []; seen = set()
+            for t in dict.fromkeys(k.strip() for k in key.split(',')): # dict.fromkeys keeps order, drops repeats
+                if not t: continue
+                for e in self.string_index.get(t, ()):
+                    rid = e[1:] # (path, original, type)
+                    if rid not in seen: seen.add(rid); entries.append(e)
+        # Index entries are (fqn, path, original, type) tuples; callers get dicts, built only for the matches
+        return [{'fqn': fqn, 'path': path, 'original': original, 'type': kind} for fqn, path, original, kind in entries]
 
     def get_spring_components(self, component_type_filter=None):
         """Returns a sorted list of SpringBootComponent objects, optionally filtered by type."""
         target_type_lower = component_type_filter.lower() if component_type_filter else None
         results = []
-        known_spring_types_lower = {sa[1:].lower() for sa in self.SPRING_ANNOTATIONS} # Pre-calculate lowercase set
+        known_spring_types_lower = self.SPRING_ANNOTATION_MAP.keys() # Set-like view of the lowercase names
 
         for fqn, comp in self.components.items():
             # SAFE: Ensure component_type is a string before lowercasing
@@ -1175,15 +1424,15 @@ class SpringBootExplorer:
         return sorted(incoming_callers, key=lambda x: x['method'])
 
 
-    def print_project_structure(self):
-        """Prints the indexed project structure to the console."""
+    def print_project_structure(self, out=None):
+        """Prints the indexed project structure to the console, or to the given text stream."""
         # Uses colored utility function
         root_name = self.index_structure.get('name', 'Project Root')
-        print(colored(f"\n--- Project Structure: {root_name} ---", Colors.BOLD + Colors.UNDERLINE))
-        self._print_node_ascii(self.index_structure.get('children', []), "")
-        print("--- End of Structure ---")
+        print(colored(f"\n--- Project Structure: {root_name} ---", Colors.BOLD + Colors.UNDERLINE), file=out)
+        self._print_node_ascii(self.index_structure.get('children', []), "", out)
+        print("--- End of Structure ---", file=out)
 
-    def _print_node_ascii(self, children, prefix):
+    def _print_node_ascii(self, children, prefix, out=None):
         # SAFE: Ensure children is iterable
         safe_children = children or []
         # Sort children: directories first, then by name
@@ -1210,12 +1459,12 @@ class SpringBootExplorer:
             name_str = colored(name, name_color)
             index_str = colored(f"[{index}]", Colors.BRIGHT_MAGENTA) # Add brackets to index
 
-            print(f"{prefix}{ptr}{index_str} {name_str}")
+            print(f"{prefix}{ptr}{index_str} {name_str}", file=out)
 
             # Recurse into directories
             if child.get('type') == 'directory':
                  # SAFE: Pass child's children list safely using 'or []'
-                 self._print_node_ascii(child.get('children', []) or [], prefix + child_prefix)
+                 self._print_node_ascii(child.get('children', []) or [], prefix + child_prefix, out)
 
 
     def get_parse_errors(self):
@@ -1419,14 +1668,10 @@ class SpringBootExplorer:
                 # For now, duplicate simplified view logic here
                 try:
                     clear_screen(); print(colored(f"Viewing File: {file_path_to_view}", Colors.BOLD)); print(colored("="*80, Colors.BRIGHT_CYAN))
-                    content = ""; page_size = os.get_terminal_size().lines - 5 if hasattr(os, 'get_terminal_size') else 30
-                    read_ok = False; encs = ['utf-8','latin-1','cp1252']
-                    for enc in encs:
-                        try:
-                            with open(file_path_to_view,'r',encoding=enc) as f: content=f.read(); read_ok=True; break
-                        except UnicodeDecodeError: continue
-                        except Exception as e_r: raise IOError(f"Read error ({enc}): {e_r}") from e_r
-                    if not read_ok: raise IOError("Cannot read file with tested encodings")
+                    page_size = os.get_terminal_size().lines - 5 if hasattr(os, 'get_terminal_size') else 30
+                    try: content = read_source(file_path_to_view)
+                    except OSError as e_r: raise IOError(f"Read error: {e_r}") from e_r
+                    if content is None: raise IOError("Cannot read file with tested encodings")
 
                     lines = content.splitlines(); line_count = len(lines)
                     for page_start in range(0, line_count, page_size):
@@ -1560,3 +1805,47 @@ class SpringBootExplorer:
              msg = f"An unexpected error occurred during patch creation: {e}"; logger.error(msg, exc_info=True); return False, msg
 
 # --- End SpringBootExplorer ---
+
+
+# --- Process-Pool Parsing Worker ---
+# Module-level so ProcessPoolExecutor can pickle them by reference. Each worker process holds one bare explorer
+# (no __init__: no log banner, no cache dir creation) and reuses the normal _parse_java_file code path per file.
+_worker_explorer = None
+
+def _init_parse_worker(project_path, quiet=False):
+    global _worker_explorer
+    if quiet:
+        import logging; logging.disable(logging.CRITICAL)
+    _worker_explorer = SpringBootExplorer.__new__(SpringBootExplorer); _worker_explorer.project_path = project_path
+
+def _parse_java_file_in_worker(file_path, index):
+    ex = _worker_explorer
+    ex.components = {}; ex.methods = {}; ex.parse_errors = []; ex.package_structure = defaultdict(list); ex._packaged_fqns = set()
+    ex._source_texts = {} # Not shipped back: sending the text costs about as much IPC as re-reading it in the parent
+    ex._parse_java_file(file_path, index)
+    return ex.components, ex.methods, ex.parse_errors, dict(ex.package_structure)
+# --- End Process-Pool Parsing Worker ---
+
+
+# --- String Index Scanning ---
+# Module-level for the same reason: _build_string_index may run _scan_index_file in worker processes.
+# Identifiers allow the Latin-1 letters common in some languages. {2,} applies the 3-char minimum inside the regex
+# engine; identifiers can't be all digits, so no isdigit() check.
+_IDENTIFIER_REGEX = re.compile(r'\b[a-zA-Z_\u00C0-\u00FF][a-zA-Z0-9_\u00C0-\u00FF]{2,}\b')
+# Same pattern with ASCII-only \b, for pure-ASCII files (most Java source), where both give identical matches.
+# Unicode \b checks every boundary character's Unicode category, which makes the scan about twice as slow.
+_IDENTIFIER_REGEX_ASCII = re.compile(_IDENTIFIER_REGEX.pattern, re.ASCII)
+_STRING_LITERAL_REGEX = re.compile(r'"((?:\\.|[^"\\])*)"') # Standard Java string literals (handles basic escapes)
+
+def _scan_index_content(content, read_err=None):
+    # Returns ((distinct identifiers, literals longer than 1 char in source order) or None, read error, scan error)
+    if content is None: return None, read_err, None
+    identifier_regex = _IDENTIFIER_REGEX_ASCII if content.isascii() else _IDENTIFIER_REGEX # isascii() is O(1) on str
+    try: return (list(set(identifier_regex.findall(content))), [lit for lit in _STRING_LITERAL_REGEX.findall(content) if len(lit) > 1]), None, None
+    except Exception as e: return None, None, e
+
+def _scan_index_file(file_path):
+    try: content = read_source(file_path)
+    except OSError as e: return None, e, None
+    return _scan_index_content(content)
+# --- End String Index Scanning ---
@@ -9,39 +9,125 @@ class SpringBootComponent:
         self.methods={}; self.fields={}; self.imports=[]; self.extends=None; self.implements=[]
         self.annotations=[]; self.package=""; self.inner_classes=[]; self.generics=[]; self.fully_qualified_name=""
     def __str__(self): return f"{self.index}: {self.component_type} - {self.name}"
-    def to_dict(self): return {k: (v.to_dict() if hasattr(v,'to_dict') else ({n:m.to_dict() for n,m in v.items()} if k=='methods' else ({n:str(f) for n,f in v.items()} if k=='fields' else v))) for k, v in self.__dict__.items() if k != 'source_code'}
+    def to_dict(self): return {k: (v.to_dict() if hasattr(v,'to_dict') else ({n:m.to_dict() for n,m in v.items()} if k=='methods' else ({n:str(f) for n,f in v.items()} if k=='fields' else v))) for k, v in self.__dict__.items() if k != 'source_code' and not k.startswith('_')}
+    # Sorted views for display, built on first access and reused across re-renders.
+    # fields/methods are only added to during parsing, so a size change is enough to invalidate.
+    @property
+    def sorted_fields(self):
+        cached = self.__dict__.get('_sorted_fields')
+        if cached is None or cached[0] != len(self.fields):
+            cached = self._sorted_fields = (len(self.fields), sorted(self.fields.items()))
+        return cached[1]
+    # Import lookups for type resolution, split once from the imports list and rebuilt if it is replaced or grows
+    def _import_lookup(self):
+        cached = self.__dict__.get('_import_lookup_cache'); imports = self.imports or []
+        if cached is None or cached[0] is not imports or cached[1] != len(imports):
+            by_name = {}; wildcard_prefixes = []
+            for imp in imports:
+                if not imp or '.' not in imp: continue
+                if imp.endswith('.*'): wildcard_prefixes.append(imp[:-1])
+                else: by_name.setdefault(imp.rpartition('.')[2], imp)
+            cached = self._import_lookup_cache = (imports, len(imports), by_name, wildcard_prefixes)
+        return cached
+    @property
+    def imports_by_simple_name(self):
+        # {last dotted segment: import}; the first import of a name wins, as in a linear scan
+        return self._import_lookup()[2]
+    @property
+    def wildcard_import_prefixes(self):
+        # "java.util." for each "import java.util.*;", in import order
+        return self._import_lookup()[3]
+    # Pre-rendered colored list lines, rebuilt only if the FQN or type they were rendered from changes
+    def _rendered(self, attr, render):
+        key = (self.fully_qualified_name, self.component_type); cached = self.__dict__.get(attr)
+        if cached is None or cached[0] != key:
+            from .utils import Colors, colored # Deferred: models stays free of UI imports until something is displayed
+            color = Colors.component_color(self.component_type)
+            cached = (key, render(colored, colored(self.fully_qualified_name, color), color)); setattr(self, attr, cached)
+        return cached[1]
+    @property
+    def cached_menu_line(self):
+        # "  - <fqn> (<type>)" as shown in the all-components listing
+        return self._rendered('_menu_line', lambda colored, fqn_str, color: f"  - {fqn_str} ({colored(self.component_type, color) if self.component_type else colored('Unknown', color)})")
+    @property
+    def cached_match_label(self):
+        # "<fqn> (<type>)" as shown when picking between several matches
+        return self._rendered('_match_label', lambda colored, fqn_str, color: f"{fqn_str} {colored(f'({self.component_type})', color) if self.component_type else ''}")
+    @property
+    def sorted_method_arrays(self):
+        # (names, methods): two aligned lists sorted by display name; constructors display as ClassName(params).
+        # Only an index order is sorted (no per-method tuples), and the result is cached until methods changes size.
+        cached = self.__dict__.get('_sorted_method_arrays')
+        if cached is None or cached[0] != len(self.methods):
+            names = [f"{self.name}{m.signature}" if m.name == '<init>' else sig for sig, m in self.methods.items()]
+            meths = list(self.methods.values())
+            order = sorted(range(len(names)), key=names.__getitem__) # Stable, so ties keep insertion order
+            cached = self._sorted_method_arrays = (len(self.methods), [names[i] for i in order], [meths[i] for i in order])
+        return cached[1], cached[2]
 
 class Field:
     def __init__(self, name, field_type, modifiers, parent_component):
         self.name=name; self.field_type=field_type; self.modifiers=modifiers; self.parent_component=parent_component; self.annotations=[]
     def __str__(self): return f"{' '.join(self.modifiers)} {self.field_type} {self.name}"
+    @property
+    def base_type(self):
+        # field_type without generic arguments ("Map<K,V>" -> "Map"), split once per field type
+        cached = self.__dict__.get('_base_type')
+        if cached is None or cached[0] is not self.field_type:
+            cached = self._base_type = (self.field_type, str(self.field_type).split('<', 1)[0])
+        return cached[1]
 
 class Method:
     def __init__(self, name, signature, body, parent_component):
         self.name=name; self.signature=signature; self.parent_component=parent_component # Body not stored
         self.calls=[]; self.called_by=[]; self.annotations=[]; self.modifiers=[]; self.return_type=None
         self.parameters=[]; self.exceptions=[]; self.start_line=0; self.end_line=0
-        self.source_lines=[]; self.method_invocations=[] # Raw nodes
+        self.source_lines=[]; self.method_invocations=[] # (qualifier or None, member, argument count or -1) per call site
+        self.canonical_key=None # Key in SpringBootExplorer.methods ("pkg.Class.name(Type1,Type2)"), set when registered
     def __str__(self): return f"{self.parent_component.name}.{self.name}{self.signature}"
+    @property
+    def parameter_base_types(self):
+        # [(base type, name)] from the "Type name" parameter strings, in declaration order; rebuilt if parameters changes
+        cached = self.__dict__.get('_parameter_base_types'); params = self.parameters or []
+        if cached is None or cached[0] is not params or cached[1] != len(params):
+            parsed = [(parts[0].split('<', 1)[0], parts[-1]) for parts in (p.split() for p in params if p) if len(parts) > 1]
+            cached = self._parameter_base_types = (params, len(params), parsed)
+        return cached[2]
+    @property
+    def local_base_types(self):
+        # {name: base type} for the names a call qualifier can refer to: the parent component's fields, then this
+        # method's parameters. A field shadows a same-named parameter and the first parameter of a name wins, matching
+        # the field-then-parameter lookup order of call resolution.
+        fields = self.parent_component.fields or {}; params = self.parameter_base_types
+        cached = self.__dict__.get('_local_base_types')
+        if cached is None or cached[0] != len(fields) or cached[1] is not params:
+            local = {name: f.base_type for name, f in fields.items()}
+            for base, name in params: local.setdefault(name, base)
+            cached = self._local_base_types = (len(fields), params, local)
+        return cached[2]
     def to_dict(self): return {k:v for k,v in {'name': self.name, 'signature': self.signature, 'annotations': self.annotations, 'modifiers': self.modifiers, 'return_type': str(self.return_type) if self.return_type else None, 'parameters': self.parameters, 'exceptions': self.exceptions, 'start_line': self.start_line, 'end_line': self.end_line, 'calls': [str(c) for c in self.calls], 'called_by': [str(c) for c in self.called_by]}.items()}
 
 class MethodCallVisitor:
-    def __init__(self, method): self.method=method; self.calls=[]; self.method_invocations=[]
+    # The lists keep first-seen order; the companion sets make each "already recorded?" check O(1)
+    # (javalang nodes compare by identity, so they hash fine)
+    def __init__(self, method): self.method=method; self.calls=[]; self.method_invocations=[]; self._seen_calls=set(); self._seen_invocations=set()
+    def _record(self, node):
+        # Call sites are kept as (qualifier or None, member, argument count or -1), all that call resolution reads; unlike
+        # the javalang subtrees they are cheap to pickle back from parse workers and into the cache
+        if node not in self._seen_invocations:
+            self._seen_invocations.add(node); args = node.arguments
+            self.method_invocations.append((str(node.qualifier) if node.qualifier else None, node.member, len(args) if args is not None else -1))
+        q = node.qualifier or "this"; n = node.member; t = (str(q), n) # Convert qualifier node/str to str
+        if t not in self._seen_calls: self._seen_calls.add(t); self.calls.append(t)
     def visit(self, node):
-        if isinstance(node, MethodInvocation):
-            if node not in self.method_invocations: self.method_invocations.append(node)
-            q = node.qualifier or "this"; n = node.member; t = (str(q), n) # Convert qualifier node/str to str
-            if t not in self.calls: self.calls.append(t)
+        if isinstance(node, MethodInvocation): self._record(node)
         # Recurse using filter
         # Note: javalang's filter might not work exactly as intended recursively here.
         # A full AST traversal might be needed for deep calls, but we keep original logic.
         try:
             # Attempt filter, acknowledging potential limitations
             for _, child in node.filter(MethodInvocation):
-                if isinstance(child, MethodInvocation): # Double check type
-                    if child not in self.method_invocations: self.method_invocations.append(child)
-                    cq = child.qualifier or "this"; cn = child.member; ct = (str(cq), cn)
-                    if ct not in self.calls: self.calls.append(ct)
+                if isinstance(child, MethodInvocation): self._record(child) # Double check type
         except AttributeError: # Handle nodes without filter or other issues gracefully
             pass
         except Exception: # Catch unexpected errors during traversal
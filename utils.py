@@ -1,14 +1,28 @@
 # spring_explorer/utils.py
 import os
 import sys
-import logging
+import io
+import codecs
+from contextlib import contextmanager
+from functools import lru_cache
 
 # --- Logging Setup ---
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger("SpringBootExplorer")
+# The logger (and logging.basicConfig) is created on first access to `utils.logger`,
+# so runs that never log (--help, --clear-cache-only) skip the logging import and handler setup.
+def _init_logger():
+    import logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    return logging.getLogger("SpringBootExplorer")
+
+def __getattr__(name):
+    if name == "logger":
+        global logger
+        logger = _init_logger() # Bind as a real module attribute so this only runs once
+        return logger
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 # --- End Logging Setup ---
 
 # --- Color Class and Functions ---
@@ -22,6 +36,7 @@ class Colors:
     BOLD = '\033[1m'; UNDERLINE = '\033[4m'; REVERSED = '\033[7m'; END = '\033[0m'
 
     @staticmethod
+    @lru_cache(maxsize=64) # Only a handful of distinct component types; called for every row of every listing
     def component_color(component_type):
         if not component_type: return Colors.WHITE
         ct = component_type.lower()
@@ -40,17 +55,95 @@ def supports_color():
     if sys.platform != 'win32': return is_a_tty
     return is_a_tty or 'ANSICON' in os.environ
 
-# IMPORTANT: This global needs to be potentially modified by __main__.py
-USE_COLORS = supports_color()
+def _colored(text, color, end_color=Colors.END): return f"{color}{text}{end_color}"
+def _success(text): return f"{Colors.BRIGHT_GREEN}{text}{Colors.END}"
+def _error(text): return f"{Colors.BRIGHT_RED}{text}{Colors.END}"
+def _info(text): return f"{Colors.BRIGHT_CYAN}{text}{Colors.END}"
+def _warning(text): return f"{Colors.BRIGHT_YELLOW}{text}{Colors.END}"
+def _plain(text, *args, **kwargs): return text
+
+def _no_ansi(*args): return ''
+
+def set_use_colors(enabled):
+    # Rebinds the helpers once instead of checking USE_COLORS on every call.
+    # IMPORTANT: Modules that did `from .utils import colored, ...` keep the binding active when they were
+    # imported, so __main__.py must call this before importing cli/explorer.
+    global USE_COLORS, colored, success, error, info, warning
+    global C_END, C_WHITE, C_BRIGHT_CYAN, C_BRIGHT_GREEN, C_BRIGHT_YELLOW, component_ansi
+    USE_COLORS = bool(enabled)
+    if USE_COLORS: colored, success, error, info, warning = _colored, _success, _error, _info, _warning
+    else: colored = success = error = info = warning = _plain
+    # Bare escape codes ('' with colors off) for hot render loops: f"{C_BRIGHT_CYAN}{s}{C_END}" is colored(s, ...)
+    # without the function call. component_ansi(type) is Colors.component_color, or '' with colors off.
+    if USE_COLORS:
+        C_END, C_WHITE, C_BRIGHT_CYAN, C_BRIGHT_GREEN, C_BRIGHT_YELLOW = Colors.END, Colors.WHITE, Colors.BRIGHT_CYAN, Colors.BRIGHT_GREEN, Colors.BRIGHT_YELLOW
+        component_ansi = Colors.component_color
+    else: C_END = C_WHITE = C_BRIGHT_CYAN = C_BRIGHT_GREEN = C_BRIGHT_YELLOW = ''; component_ansi = _no_ansi
+
+set_use_colors(supports_color())
 
-def colored(text, color, end_color=Colors.END): return f"{color}{text}{end_color}" if USE_COLORS else text
 def header(text): return colored(f" {text} ", Colors.WHITE+Colors.BG_BLUE+Colors.BOLD)
-def menu_option(index, text): return f"{colored(str(index), Colors.BRIGHT_YELLOW)} - {colored(text, Colors.WHITE)}"
+def menu_option(index, text): return f"{C_BRIGHT_YELLOW}{index}{C_END} - {C_WHITE}{text}{C_END}"
 def menu_title(text):
     line = "─" * (len(text) + 4); return f"\n{colored(line, Colors.BRIGHT_BLUE)}\n{colored('┌', Colors.BRIGHT_BLUE)}{colored(f' {text} ', Colors.BOLD + Colors.BRIGHT_WHITE)}{colored('┐', Colors.BRIGHT_BLUE)}\n{colored(line, Colors.BRIGHT_BLUE)}" if USE_COLORS else f"\n=== {text} ==="
-def success(text): return colored(text, Colors.BRIGHT_GREEN)
-def error(text): return colored(text, Colors.BRIGHT_RED)
-def info(text): return colored(text, Colors.BRIGHT_CYAN)
-def warning(text): return colored(text, Colors.BRIGHT_YELLOW)
-def clear_screen(): os.system('cls' if os.name == 'nt' else 'clear')
+# Same bytes `clear` emits (cursor home, erase screen, erase scrollback), written directly instead of
+# spawning a shell + `clear` process on every menu redraw. `clear` prints nothing for TERM=dumb/unset either.
+_CLEAR_SEQUENCE = "\033[H\033[2J\033[3J"
+def clear_screen(out=None):
+    # out: a batched_stdout() buffer to write the sequence into, so it goes out with the rest of the frame
+    if os.name == 'nt': os.system('cls') # Legacy conhost may not interpret VT sequences
+    elif os.environ.get('TERM', 'dumb') != 'dumb':
+        if out is not None: out.write(_CLEAR_SEQUENCE)
+        else: sys.stdout.write(_CLEAR_SEQUENCE); sys.stdout.flush()
 # --- End Color Functions ---
+
+# --- Output Batching ---
+@contextmanager
+def batched_stdout():
+    # Yields a buffer that the block renders into explicitly (print(..., file=out), out.write) and emits it with one
+    # write + flush on exit, so a menu frame is a single syscall instead of one per print() line. sys.stdout itself is
+    # never swapped, so output from other threads (e.g. background analysis) is not captured into the frame.
+    buf = io.StringIO()
+    try: yield buf
+    finally: sys.stdout.write(buf.getvalue()); sys.stdout.flush()
+# --- End Output Batching ---
+
+# --- Source File Reading ---
+SOURCE_ENCODINGS = ('utf-8', 'latin-1', 'cp1252')
+
+def read_source(path, encodings=SOURCE_ENCODINGS):
+    # Reads the bytes once and tries each encoding on the in-memory buffer instead of re-opening the file per encoding.
+    # Returns None if no encoding fits; OSError from open/read propagates. Newlines are translated like text-mode open().
+    with open(path, 'rb') as f: data = f.read()
+    for enc in encodings:
+        try: text = data.decode(enc)
+        except UnicodeDecodeError: continue
+        return text.replace('\r\n', '\n').replace('\r', '\n') if '\r' in text else text
+    return None
+
+def open_source(path, encodings=SOURCE_ENCODINGS, sniff_size=65536):
+    # Opens a source file for streaming (e.g. paging) without reading it whole. The encoding is picked from the
+    # first sniff_size bytes only; anything undecodable past that point is replaced rather than raising mid-stream.
+    f = open(path, 'rb')
+    try:
+        head = f.read(sniff_size); f.seek(0)
+        enc = encodings[-1]
+        for candidate in encodings:
+            try: codecs.getincrementaldecoder(candidate)().decode(head, final=False); enc = candidate; break # final=False tolerates a cut-off multibyte char
+            except UnicodeDecodeError: continue
+        return io.TextIOWrapper(f, encoding=enc, errors='replace')
+    except BaseException: f.close(); raise
+
+def _read_source_or_error(path):
+    try: return read_source(path), None
+    except OSError as e: return None, e
+
+def read_all(paths):
+    # Returns {path: (content or None, OSError or None)} for each unique path.
+    # File reads release the GIL, so a thread pool overlaps the I/O waits of many small source files.
+    paths = list(dict.fromkeys(paths))
+    if len(paths) < 2: return {p: _read_source_or_error(p) for p in paths}
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4, len(paths))) as executor:
+        return dict(zip(paths, executor.map(_read_source_or_error, paths)))
+# --- End Source File Reading ---